@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+# run_benchmarks.py
+# Pruebas de rendimiento de los puntos críticos con catálogos sintéticos.
+# Uso: python -m benchmarks.run_benchmarks --sizes 1e3 1e4 1e5 [--compare anterior.json]
+import argparse
+import json
+import platform
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_store
+from src.star_data import STANDARD_STARS, calculate_batch, calculate_stars, stars_to_columns
+from visualization.tables import create_input_table, create_results_table, format_table
+from visualization.table_export import write_csv, write_excel, write_latex
+from visualization.hr_diagram import plot_hr_diagram
+
+DEFAULT_SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+RESULTS_DIR = Path(__file__).parent / "results"
+# Límite de filas de una hoja de Excel
+EXCEL_MAX_ROWS = 1048575
+# Empeoramiento relativo a partir del cual se marca una regresión
+REGRESSION_THRESHOLD = 1.2
+
+def timed(func, repeat=1):
+    """Mejor tiempo (s) de repeat ejecuciones de func"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def benchmarks_for(store, workdir):
+    """Puntos críticos a medir para un catálogo: lista de (nombre, función)"""
+    cols = stars_to_columns(store)
+    results = calculate_stars(store)
+    tables = {}
+
+    def build_tables():
+        tables['input'] = create_input_table(store)
+        tables['results'] = create_results_table(results)
+
+    def show_page():
+        # Lo que formatea la tabla virtual al mostrar una pantalla
+        format_table(tables['input'].iloc[:25])
+        format_table(tables['results'].iloc[:25])
+
+    def draw():
+        fig = plot_hr_diagram(STANDARD_STARS, results, save_path=None)
+        fig.canvas.draw()
+        plt.close(fig)
+
+    def draw_and_save():
+        fig = plot_hr_diagram(STANDARD_STARS, results, save_path=None)
+        fig.savefig(workdir / "hr.png", dpi=300, bbox_inches='tight')
+        plt.close(fig)
+
+    def export(fmt):
+        def run():
+            if fmt == 'csv':
+                write_csv(tables['results'], workdir / "r.csv")
+            elif fmt == 'latex':
+                write_latex([('Resultados', tables['results'])], workdir / "r.tex",
+                            formatter=format_table)
+            elif fmt == 'excel':
+                write_excel([('Resultados', tables['results'])], workdir / "r.xlsx")
+            else:
+                from src.columnar_io import write_frame, results_frame
+                write_frame(results_frame(results), workdir / f"r.{fmt}")
+        return run
+
+    build_tables()
+    benches = [
+        ('calculate_batch', lambda: calculate_batch(cols['angular_displacement'], cols['delta_time'],
+                                                    cols['parallax'], cols['B'], cols['V'], cols['vr'])),
+        ('calculate_stars', lambda: calculate_stars(store)),
+        ('create_tables', build_tables),
+        ('format_visible_rows', show_page),
+        ('plot_hr_diagram_draw', draw),
+        ('plot_hr_diagram_save', draw_and_save),
+        ('export_csv', export('csv')),
+        ('export_latex', export('latex')),
+        ('export_parquet', export('parquet')),
+        ('export_feather', export('feather')),
+    ]
+    if len(store) <= EXCEL_MAX_ROWS:
+        benches.append(('export_excel', export('excel')))
+    return benches
+
+def run(sizes, repeat=1, only=None):
+    """Ejecuta todas las pruebas para cada tamaño de catálogo"""
+    records = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for size in sizes:
+            store = synthetic_store(size)
+            for name, func in benchmarks_for(store, workdir):
+                if only and name not in only:
+                    continue
+                try:
+                    seconds = timed(func, repeat)
+                except Exception as e:
+                    # Una prueba fallida no detiene el resto (p. ej. falta una dependencia)
+                    records.append({'bench': name, 'size': size, 'seconds': None, 'error': str(e)})
+                    print(f"{name:<24} n={size:<10} ERROR: {str(e)}")
+                    continue
+                records.append({'bench': name, 'size': size, 'seconds': seconds})
+                print(f"{name:<24} n={size:<10} {seconds:10.4f} s")
+    return records
+
+def compare(records, previous_path, threshold=REGRESSION_THRESHOLD):
+    """Compara con una ejecución anterior y devuelve las regresiones"""
+    with open(previous_path, encoding='utf-8') as f:
+        previous = {(r['bench'], r['size']): r['seconds'] for r in json.load(f)['results']
+                    if r.get('seconds')}
+
+    regressions = []
+    for record in records:
+        old = previous.get((record['bench'], record['size']))
+        if not old or record['seconds'] is None:
+            continue
+        ratio = record['seconds'] / old
+        flag = 'REGRESIÓN' if ratio > threshold else ''
+        print(f"{record['bench']:<24} n={record['size']:<10} x{ratio:6.2f} {flag}")
+        if ratio > threshold:
+            regressions.append(dict(record, previous_seconds=old, ratio=ratio))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pruebas de rendimiento con catálogos sintéticos")
+    parser.add_argument('--sizes', nargs='+', type=float, default=DEFAULT_SIZES,
+                        help="Tamaños de catálogo (por defecto 1e3 ... 1e7)")
+    parser.add_argument('--repeat', type=int, default=1, help="Repeticiones (se toma la mejor)")
+    parser.add_argument('--only', nargs='+', help="Ejecuta solo estas pruebas")
+    parser.add_argument('--out', help="Fichero JSON de salida (por defecto en benchmarks/results)")
+    parser.add_argument('--compare', metavar='JSON', help="Ejecución anterior con la que comparar")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes]
+    records = run(sizes, args.repeat, args.only)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'matplotlib': matplotlib.__version__,
+            'platform': platform.platform(),
+            'repeat': args.repeat
+        },
+        'results': records
+    }
+    out = Path(args.out) if args.out else RESULTS_DIR / f"bench_{datetime.now():%Y%m%d_%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Resultados guardados en: {out}")
+
+    if args.compare:
+        regressions = compare(records, args.compare)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
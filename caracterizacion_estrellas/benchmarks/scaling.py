@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+# scaling.py
+# Escalado de src/parallel con el número de procesos (1 ... N núcleos).
+# Uso: python -m benchmarks.scaling --size 1e7 [--max-workers 8] [--classify]
+import argparse
+import json
+import os
+import platform
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.run_benchmarks import RESULTS_DIR, timed
+from benchmarks.synthetic import synthetic_columns
+from src.parallel import INPUT_LAYOUT, calculate_parallel
+
+def run(size, max_workers, repeat=1, classify=False):
+    """Tiempo de calculate_parallel para 1 ... max_workers procesos"""
+    full = synthetic_columns(size)
+    columns = {field: full[field] for field, _ in INPUT_LAYOUT}
+
+    records = []
+    baseline = None
+    for workers in range(1, max_workers + 1):
+        seconds = timed(lambda: calculate_parallel(columns, workers, classify), repeat)
+        baseline = baseline or seconds
+        speedup = baseline / seconds
+        records.append({'workers': workers, 'size': size, 'seconds': seconds,
+                        'speedup': speedup, 'efficiency': speedup / workers})
+        print(f"workers={workers:<3} n={size:<10} {seconds:10.4f} s  "
+              f"x{speedup:5.2f}  eficiencia {speedup / workers:6.1%}")
+    return records
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Escalado del cálculo multiproceso")
+    parser.add_argument('--size', type=float, default=1e7, help="Tamaño del catálogo (por defecto 1e7)")
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1,
+                        help="Número máximo de procesos (por defecto, todos los núcleos)")
+    parser.add_argument('--repeat', type=int, default=1, help="Repeticiones (se toma la mejor)")
+    parser.add_argument('--classify', action='store_true', help="Incluye la clasificación espectral")
+    parser.add_argument('--out', help="Fichero JSON de salida (por defecto en benchmarks/results)")
+    args = parser.parse_args(argv)
+
+    records = run(int(args.size), args.max_workers, args.repeat, args.classify)
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'classify': args.classify,
+            'repeat': args.repeat
+        },
+        'results': records
+    }
+    out = Path(args.out) if args.out else RESULTS_DIR / f"scaling_{datetime.now():%Y%m%d_%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Resultados guardados en: {out}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
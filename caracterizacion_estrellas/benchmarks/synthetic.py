@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+# synthetic.py
+# Catálogos sintéticos de estrellas para las pruebas de rendimiento
+import numpy as np
+from src.star_data import STANDARD_STARS
+from src.star_store import StarStore
+
+def synthetic_columns(n, seed=0):
+    """
+    Columnas de un catálogo sintético de n estrellas repartidas en torno a
+    la secuencia principal de STANDARD_STARS
+    """
+    rng = np.random.default_rng(seed)
+    bv_std = np.array([star[1] for star in STANDARD_STARS])
+    mv_std = np.array([star[2] for star in STANDARD_STARS])
+
+    b_v = rng.uniform(bv_std.min(), bv_std.max(), n)
+    mv = np.interp(b_v, bv_std, mv_std) + rng.normal(0, 0.5, n)
+    distance = rng.uniform(5, 1000, n)                          # pc
+    v = mv + 5 * (np.log10(distance) - 1)
+
+    date1 = np.datetime64('2000-01-01') + rng.integers(0, 20 * 365, n).astype('m8[D]')
+    delta_days = rng.integers(365, 20 * 365, n)
+    proper_motion = rng.lognormal(-2, 1, n)                     # "/año
+
+    return {
+        'name': np.char.add('SYN ', np.arange(n).astype(str)).astype(object),
+        'angular_displacement': proper_motion * delta_days / 365.25,
+        'date1': date1,
+        'date2': date1 + delta_days.astype('m8[D]'),
+        'delta_time': delta_days / 365.25,
+        'parallax': 1 / distance,
+        'vr': rng.normal(0, 30, n),
+        'B': v + b_v,
+        'V': v
+    }
+
+def synthetic_store(n, seed=0):
+    """Catálogo sintético como StarStore"""
+    return StarStore.from_columns(synthetic_columns(n, seed))
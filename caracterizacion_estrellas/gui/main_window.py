@@ -1,14 +1,25 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from tkcalendar import DateEntry
 from datetime import datetime
-from src.simbad_client import query_simbad  # Importamos la nueva función
+import queue
+import threading
+from src.star_store import StarStore
 
 class StarInputForm:
-    def __init__(self, root, on_submit_callback):
+    def __init__(self, root, on_submit_callback, on_change_callback=None):
         self.root = root
         self.on_submit = on_submit_callback
-        self.stars_data = []
+        self.on_change = on_change_callback
+        # Datos en columnas tipadas (compartidas con cálculos, tablas y gráfico)
+        self.stars_data = StarStore()
+        
+        # Consultas a SIMBAD en segundo plano: los resultados llegan por la cola
+        # y solo se aplica el de la consulta más reciente (_lookup_id)
+        self._simbad_queue = queue.Queue()
+        self._lookup_id = 0
+        self._lookup_pending = False
+        self._polling = False
         
         self.setup_ui()
     
@@ -37,7 +48,16 @@ class StarInputForm:
         self.search_btn = ttk.Button(input_frame, text="Buscar en SIMBAD", 
                                    command=self.fetch_simbad_data,
                                    state='disabled')
-        self.search_btn.grid(row=row, columnspan=2, pady=5)
+        self.search_btn.grid(row=row, column=0, columnspan=2, pady=5)
+        
+        self.cancel_btn = ttk.Button(input_frame, text="Cancelar búsqueda",
+                                   command=self.cancel_simbad_lookup,
+                                   state='disabled')
+        self.cancel_btn.grid(row=row, column=1, sticky=tk.E, pady=5)
+        row += 1
+        
+        self.simbad_status = ttk.Label(input_frame, text="")
+        self.simbad_status.grid(row=row, column=0, columnspan=2, sticky=tk.W)
         row += 1
         
         # Campos de datos
@@ -86,6 +106,7 @@ class StarInputForm:
         button_frame.pack(fill=tk.X, pady=10)
         
         ttk.Button(button_frame, text="Añadir Estrella", command=self.add_star).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Importar datos", command=self.import_stars).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Calcular Resultados", command=self.submit_data).pack(side=tk.RIGHT, padx=5)
         ttk.Button(button_frame, text="Limpiar", command=self.clear_form).pack(side=tk.RIGHT, padx=5)
         
@@ -99,59 +120,114 @@ class StarInputForm:
         self.search_btn['state'] = 'normal' if self.name_entry.get().strip() else 'disabled'
     
     def fetch_simbad_data(self):
-        """Versión corregida con manejo adecuado de actualización de UI"""
+        """Lanza la consulta a SIMBAD en un hilo sin bloquear la interfaz"""
         star_name = self.name_entry.get().strip()
         if not star_name:
             messagebox.showwarning("Advertencia", "Introduce un nombre de estrella primero")
             return
-            
+        
+        # Una consulta nueva deja obsoleta a cualquier otra en curso
+        self._lookup_id += 1
+        lookup_id = self._lookup_id
+        
+        worker = threading.Thread(target=self._simbad_worker,
+                                  args=(lookup_id, star_name), daemon=True)
+        worker.start()
+        
+        self._lookup_pending = True
+        self.root.config(cursor='watch')
+        self.cancel_btn['state'] = 'normal'
+        self.simbad_status.config(text=f"Consultando SIMBAD: {star_name}...")
+        
+        if not self._polling:
+            self._polling = True
+            self.root.after(100, self._poll_simbad_queue)
+    
+    def _simbad_worker(self, lookup_id, star_name):
+        """Hilo de consulta: no toca Tk, solo deja el resultado en la cola"""
         try:
-            # Configurar cursor de espera
-            self.root.config(cursor='watch')
-            self.root.update()  # Usar update() en lugar de update_idletasks()
-            
+            # astroquery se carga en la primera consulta, no al arrancar
+            from src.simbad_client import query_simbad
             data = query_simbad(star_name)
-            if not data:
-                messagebox.showwarning("SIMBAD", f"No se encontró la estrella '{star_name}'")
-                return
+            self._simbad_queue.put((lookup_id, star_name, data, None))
+        except Exception as e:
+            self._simbad_queue.put((lookup_id, star_name, None, e))
+    
+    def _poll_simbad_queue(self):
+        """Recoge (desde el hilo de Tk) los resultados de las consultas"""
+        while True:
+            try:
+                lookup_id, star_name, data, error = self._simbad_queue.get_nowait()
+            except queue.Empty:
+                break
             
-            # Actualizar solo campos con datos válidos
-            updated = []
-            if data['radial_velocity_km_s'] is not None:
-                self.vr_entry.delete(0, tk.END)
-                self.vr_entry.insert(0, f"{data['radial_velocity_km_s']:.2f}")
-                updated.append("Velocidad radial")
-                
-            if data['parallax_arcsec'] is not None:
-                self.parallax_entry.delete(0, tk.END)
-                self.parallax_entry.insert(0, f"{data['parallax_arcsec']:.6f}")
-                updated.append("Paralaje")
-                
-            if data['mag_B'] is not None:
-                self.b_mag_entry.delete(0, tk.END)
-                self.b_mag_entry.insert(0, f"{data['mag_B']:.3f}")
-                updated.append("Magnitud B")
-                
-            if data['mag_V'] is not None:
-                self.v_mag_entry.delete(0, tk.END)
-                self.v_mag_entry.insert(0, f"{data['mag_V']:.3f}")
-                updated.append("Magnitud V")
+            # Resultados de consultas canceladas o sustituidas: se descartan
+            if lookup_id != self._lookup_id:
+                continue
             
-            if not updated:
-                messagebox.showinfo("SIMBAD", 
-                                 f"Se encontró '{star_name}' pero sin los datos requeridos\n"
-                                 "Complete los campos manualmente")
+            self._finish_simbad_lookup()
+            if error is not None:
+                messagebox.showerror("Error", f"Error al consultar SIMBAD:\n{str(error)}")
             else:
-                messagebox.showinfo("SIMBAD", 
-                                 f"Datos cargados para {star_name}:\n"
-                                 f"{', '.join(updated)}")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al consultar SIMBAD:\n{str(e)}")
-        finally:
-            # Restaurar cursor normal
-            self.root.config(cursor='')
-            self.root.update()
+                self._apply_simbad_data(star_name, data)
+        
+        if self._lookup_pending:
+            self.root.after(100, self._poll_simbad_queue)
+        else:
+            self._polling = False
+    
+    def cancel_simbad_lookup(self):
+        """Cancela la consulta en curso (su resultado se ignorará al llegar)"""
+        self._lookup_id += 1
+        self._finish_simbad_lookup()
+        self.simbad_status.config(text="Búsqueda cancelada")
+    
+    def _finish_simbad_lookup(self):
+        """Restaura la interfaz al terminar o cancelar una consulta"""
+        self._lookup_pending = False
+        self.root.config(cursor='')
+        self.cancel_btn['state'] = 'disabled'
+        self.simbad_status.config(text="")
+    
+    def _apply_simbad_data(self, star_name, data):
+        """Rellena el formulario con los datos obtenidos de SIMBAD"""
+        if not data:
+            messagebox.showwarning("SIMBAD", f"No se encontró la estrella '{star_name}'")
+            return
+        
+        # Actualizar solo campos con datos válidos
+        updated = []
+        if data['radial_velocity_km_s'] is not None:
+            self.vr_entry.delete(0, tk.END)
+            self.vr_entry.insert(0, f"{data['radial_velocity_km_s']:.2f}")
+            updated.append("Velocidad radial")
+            
+        if data['parallax_arcsec'] is not None:
+            self.parallax_entry.delete(0, tk.END)
+            self.parallax_entry.insert(0, f"{data['parallax_arcsec']:.6f}")
+            updated.append("Paralaje")
+            
+        if data['mag_B'] is not None:
+            self.b_mag_entry.delete(0, tk.END)
+            self.b_mag_entry.insert(0, f"{data['mag_B']:.3f}")
+            updated.append("Magnitud B")
+            
+        if data['mag_V'] is not None:
+            self.v_mag_entry.delete(0, tk.END)
+            self.v_mag_entry.insert(0, f"{data['mag_V']:.3f}")
+            updated.append("Magnitud V")
+        
+        if not updated:
+            messagebox.showinfo("SIMBAD", 
+                             f"Se encontró '{star_name}' pero sin los datos requeridos\n"
+                             "Complete los campos manualmente")
+        else:
+            # Identificador principal de SIMBAD si se escribió otro (alias)
+            main_id = data.get('main_id')
+            alias = f" ({main_id} en SIMBAD)" if main_id and main_id != star_name else ""
+            messagebox.showinfo("SIMBAD", 
+                             f"Datos cargados para {star_name}{alias}:\n"
+                             f"{', '.join(updated)}")
     
     def update_delta_time(self, event=None):
         """Calcula Δt en años cuando se seleccionan fechas"""
@@ -201,6 +277,8 @@ class StarInputForm:
                 raise ValueError("El desplazamiento angular debe ser positivo")
                 
             self.stars_data.append(star_data)
+            if self.on_change is not None:
+                self.on_change(self.stars_data)
             self.clear_form()
             messagebox.showinfo("Éxito", f"Estrella {star_name} añadida correctamente")
             
@@ -209,6 +287,30 @@ class StarInputForm:
         except Exception as e:
             messagebox.showerror("Error inesperado", f"Ocurrió un error: {str(e)}")
     
+    def import_stars(self):
+        """Añade las estrellas de un fichero Parquet/Feather exportado antes"""
+        path = filedialog.askopenfilename(
+            title="Importar datos de entrada",
+            filetypes=[("Parquet / Feather", "*.parquet *.feather *.arrow"),
+                       ("Todos los archivos", "*.*")])
+        if not path:
+            return
+        try:
+            # pyarrow se carga solo al importar
+            from src.columnar_io import load_stars
+            imported = load_stars(path)
+        except (ImportError, ValueError) as e:
+            messagebox.showerror("Error al importar", str(e))
+            return
+        except Exception as e:
+            messagebox.showerror("Error inesperado", f"No se pudo leer el fichero: {str(e)}")
+            return
+        
+        self.stars_data.extend(imported)
+        if self.on_change is not None:
+            self.on_change(self.stars_data)
+        messagebox.showinfo("Éxito", f"{len(imported)} estrellas importadas")
+    
     def submit_data(self):
         """Envía todos los datos para procesamiento"""
         if not self.stars_data:
@@ -5,53 +5,33 @@ from tkinter import ttk
 from tkinter import messagebox 
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from src.star_data import STANDARD_STARS
-from visualization.hr_diagram import plot_hr_diagram
+from src.star_data import STANDARD_STARS, as_array, is_structured
+from visualization.tables import (create_input_table, create_results_table, flag_duplicates,
+                                  format_table)
+from visualization.hr_diagram import plot_hr_diagram, export_hr_diagram, update_hr_diagram
+import queue
+import threading
+from src.columnar_io import write_frame, stars_frame, results_frame
+from gui.virtual_table import VirtualTable
+from src import tracing
+from visualization.table_export import ProgressCounter, write_csv, write_excel, write_latex
 import pandas as pd
 # Para exportación de tablas
 from datetime import datetime
 import os
 from pathlib import Path
 
-def create_input_table(stars_data):
-    """Crea tabla de datos de entrada actualizada"""
-    data = []
-    for star in stars_data:
-        data.append([
-            star['name'],
-            f"{star['angular_displacement']:.4f}",  # φ
-            star['date1'].strftime('%Y-%m-%d'),
-            star['date2'].strftime('%Y-%m-%d'),
-            f"{star['delta_time']:.2f}",
-            f"{star['parallax']:.4f}",  # π
-            f"{star['vr']:.2f}",
-            f"{star['B']:.2f}",
-            f"{star['V']:.2f}"
-        ])
-    
-    return pd.DataFrame(data, columns=[
-        'Nombre', 'φ (")', 'Fecha 1ª obs.', 'Fecha 2ª obs.', 
-        'Δt (años)', 'π (")', 'Vr (km/s)', 'B', 'V'
-    ])
+def take_rows(records, indices):
+    """Filas indicadas de una lista de diccionarios o de datos columnares"""
+    if is_structured(records):
+        return records[indices]
+    return [records[i] for i in indices]
 
-def create_results_table(calculated_results):
-    """Crea tabla de resultados calculados"""
-    data = []
-    for star in calculated_results:
-        data.append([
-            star['Nombre'],
-            f"{star['Mov_propio']:.4f}",
-            f"{star['Distancia']:.2f}",
-            f"{star['B-V']:.2f}",
-            f"{star['Mv']:.2f}",
-            f"{star['Vt']:.2f}",
-            f"{star['V_total']:.2f}"
-        ])
-    
-    return pd.DataFrame(data, columns=[
-        'Nombre', 'Mov. propio ("/año)', 'Distancia (pc)', 
-        'Índice espectral (B-V)', 'Mv', 'Vt (km/s)', 'V total (km/s)'
-    ])
+def snapshot_rows(records):
+    """Copia de longitud fija (el StarStore crece y se reescribe en su sitio)"""
+    if is_structured(records):
+        return as_array(records).copy()
+    return list(records)
 
 class ResultsWindow:
     def __init__(self, root, stars_data, calculated_results):
@@ -59,8 +39,21 @@ class ResultsWindow:
         self.root.title("Resultados del Análisis Estelar")
         self.stars_data = stars_data
         self.calculated_results = calculated_results
+        self.hr_figure = None
+        # Clave canónica (índice de alias de SIMBAD) de cada nombre ya visto
+        self._canonical_ids = {}
+        # Versión de la tabla de resultados para la que se buscan duplicados
+        self._duplicates_generation = 0
+        # Avisos de fin de exportación del diagrama HR (desde el hilo de exportación)
+        self._hr_export_queue = queue.Queue()
+        # Progreso y fin de la exportación de tablas (desde su hilo)
+        self._table_export_queue = queue.Queue()
+        self._table_export_thread = None
         
         self.setup_ui()
+        
+        # Exportación del diagrama HR una vez mostrada la ventana
+        self.root.after_idle(self.export_hr_diagram)
     
 
     def setup_ui(self):
@@ -69,14 +62,15 @@ class ResultsWindow:
         
         # 1. Pestaña de datos de entrada
         input_frame = ttk.Frame(notebook)
-        input_table = create_input_table(self.stars_data)  # Guardamos la tabla en una variable
-        self.create_table(input_frame, input_table)
+        with tracing.span('tablas', stars=len(self.stars_data)):
+            self.input_table = create_input_table(self.stars_data)  # Guardamos la tabla
+            self.results_table = self.with_duplicates(create_results_table(self.calculated_results))
+        self.input_view = self.create_table(input_frame, self.input_table)
         notebook.add(input_frame, text="Datos de Entrada")
         
         # 2. Pestaña de resultados
         results_frame = ttk.Frame(notebook)
-        results_table = create_results_table(self.calculated_results)  # Guardamos la tabla
-        self.create_table(results_frame, results_table)
+        self.results_view = self.create_table(results_frame, self.results_table)
         notebook.add(results_frame, text="Resultados Calculados")
         
         # 3. Pestaña del diagrama HR
@@ -93,48 +87,189 @@ class ResultsWindow:
         export_btn_style.configure('Export.TButton', foreground='blue')
         
         ttk.Button(export_frame, text="Exportar a CSV", 
-                  command=lambda: self.export_tables(input_table, results_table, 'csv'),
+                  command=lambda: self.export_tables(self.input_table, self.results_table, 'csv'),
                   style='Export.TButton').pack(side=tk.LEFT, padx=5)
         
         ttk.Button(export_frame, text="Exportar a Excel", 
-                  command=lambda: self.export_tables(input_table, results_table, 'excel'),
+                  command=lambda: self.export_tables(self.input_table, self.results_table, 'excel'),
                   style='Export.TButton').pack(side=tk.LEFT, padx=5)
         
         ttk.Button(export_frame, text="Exportar a LaTeX", 
-                  command=lambda: self.export_tables(input_table, results_table, 'latex'),
+                  command=lambda: self.export_tables(self.input_table, self.results_table, 'latex'),
                   style='Export.TButton').pack(side=tk.LEFT, padx=5)
-    
-    def create_table(self, parent, dataframe):
-        """Crea una tabla a partir de un DataFrame"""
-        tree = ttk.Treeview(parent)
         
-        # Columnas
-        tree["columns"] = list(dataframe.columns)
-        tree.column("#0", width=0, stretch=tk.NO)
+        ttk.Button(export_frame, text="Exportar a Parquet", 
+                  command=lambda: self.export_tables(self.input_table, self.results_table, 'parquet'),
+                  style='Export.TButton').pack(side=tk.LEFT, padx=5)
         
-        for col in dataframe.columns:
-            tree.column(col, anchor=tk.W, width=100)
-            tree.heading(col, text=col, anchor=tk.W)
+        ttk.Button(export_frame, text="Exportar a Feather", 
+                  command=lambda: self.export_tables(self.input_table, self.results_table, 'feather'),
+                  style='Export.TButton').pack(side=tk.LEFT, padx=5)
         
-        # Filas
-        for i, row in dataframe.iterrows():
-            tree.insert("", tk.END, values=list(row))
+        ttk.Button(export_frame, text="Exportar diagrama HR", 
+                  command=self.export_hr_diagram,
+                  style='Export.TButton').pack(side=tk.LEFT, padx=5)
         
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
+        # Barra de estado y progreso de la exportación de tablas
+        self.status_label = ttk.Label(export_frame, text="")
+        self.status_label.pack(side=tk.RIGHT, padx=5)
+        self.export_progress = ttk.Progressbar(export_frame, length=120, maximum=100)
+        self.export_progress.pack(side=tk.RIGHT, padx=5)
         
-        # Layout
-        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Tiempos de la última ejecución de cada etapa (solo con la medición activada)
+        self.trace_label = ttk.Label(self.root, text="", anchor=tk.W, relief=tk.SUNKEN)
+        if tracing.is_enabled():
+            self.trace_label.pack(fill=tk.X, side=tk.BOTTOM)
+        self.update_trace_status()
+    
+    def create_table(self, parent, dataframe):
+        """Crea una tabla (virtual) a partir de un DataFrame"""
+        # Solo se muestran (y se formatean) las filas visibles, leídas del DataFrame al desplazarse
+        return VirtualTable(parent, dataframe, formatter=format_table)
     
     def create_hr_diagram(self, parent):
         """Crea el diagrama HR en el frame"""
-        fig = plot_hr_diagram(STANDARD_STARS, self.calculated_results)
-        
-        canvas = FigureCanvasTkAgg(fig, master=parent)
-        canvas.draw()
+        # Sin guardado aquí: la exportación en alta resolución va en segundo plano
+        with tracing.span('hr.dibujo', stars=len(self.calculated_results)):
+            fig = plot_hr_diagram(STANDARD_STARS, self.calculated_results, save_path=None)
+            self.hr_figure = fig
+            
+            canvas = FigureCanvasTkAgg(fig, master=parent)
+            canvas.draw()
         canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.hr_canvas = canvas
+    
+    def update_results(self, stars_data, calculated_results, diff):
+        """
+        Aplica los cambios del modelo de resultados (ResultsModel.update)
+        sin reconstruir la ventana
+        """
+        self.stars_data = stars_data
+        self.calculated_results = calculated_results
+        
+        with tracing.span('tablas', stars=len(stars_data)):
+            if diff['appended_only']:
+                # Caso habitual: estrellas nuevas al final, solo se añaden esas filas
+                added = diff['added']
+                new_inputs = create_input_table(take_rows(stars_data, added))
+                new_results = create_results_table(take_rows(calculated_results, added))
+                self.input_table = pd.concat([self.input_table, new_inputs], ignore_index=True)
+                # Las filas nuevas quedan sin marcar hasta que termina la búsqueda
+                results_table = pd.concat([self.results_table, new_results.assign(Duplicada='')],
+                                          ignore_index=True)
+            else:
+                self.input_table = create_input_table(stars_data)
+                results_table = create_results_table(calculated_results)
+            self.results_table = self.with_duplicates(results_table)
+        
+        self.input_view.set_data(self.input_table)
+        self.results_view.set_data(self.results_table)
+        self.update_hr_diagram()
+        self.update_trace_status()
+    
+    def with_duplicates(self, results_table):
+        """
+        Añade la columna 'Duplicada' (vacía si no la tiene) y busca en segundo
+        plano las estrellas repetidas (mismo objeto de SIMBAD con otro nombre),
+        para que abrir o actualizar la ventana no dependa del número de filas
+        """
+        self._duplicates_generation += 1
+        generation = self._duplicates_generation
+        names = results_table['Nombre'].copy()
+        results = queue.Queue()
+        
+        def worker():
+            try:
+                results.put(self.find_duplicates(names))
+            except Exception as e:
+                print(f"No se pudieron buscar las estrellas duplicadas: {str(e)}")
+        
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(100, lambda: self._poll_duplicates(results, generation))
+        if 'Duplicada' in results_table.columns:
+            return results_table
+        return results_table.assign(Duplicada='')
+    
+    def find_duplicates(self, names):
+        """Columna 'Duplicada' de los nombres dados (en el hilo de búsqueda)"""
+        from src.simbad_cache import get_existing_cache, normalize_identifier
+        new_names = [name for name in dict.fromkeys(names) if name not in self._canonical_ids]
+        if new_names:
+            try:
+                # Sin caché de SIMBAD (nunca consultado) no se crea una vacía
+                cache = get_existing_cache()
+                keys = (cache.canonical_ids(new_names) if cache is not None
+                        else [normalize_identifier(name) for name in new_names])
+            except Exception as e:
+                # Sin índice de alias solo se detectan los nombres repetidos
+                print(f"No se pudo leer el índice de alias de SIMBAD: {str(e)}")
+                keys = [normalize_identifier(name) for name in new_names]
+            self._canonical_ids.update(zip(new_names, keys))
+        table = names.to_frame('Nombre')
+        return flag_duplicates(table, [self._canonical_ids[name] for name in names])['Duplicada']
+    
+    def _poll_duplicates(self, results, generation):
+        """Aplica la columna 'Duplicada' si sigue correspondiendo a la tabla mostrada"""
+        if not self.root.winfo_exists() or generation != self._duplicates_generation:
+            return
+        try:
+            duplicates = results.get_nowait()
+        except queue.Empty:
+            self.root.after(100, lambda: self._poll_duplicates(results, generation))
+            return
+        # Tabla nueva (no modificada): una exportación en curso conserva la suya
+        self.results_table = self.results_table.assign(Duplicada=duplicates.to_numpy())
+        self.results_view.set_data(self.results_table)
+    
+    def update_trace_status(self):
+        """Muestra en la barra inferior los tiempos de la última ejecución"""
+        if tracing.is_enabled():
+            self.trace_label.config(text=tracing.summary())
+    
+    def update_hr_diagram(self):
+        """Actualiza los puntos del diagrama HR (o lo regenera si hace falta)"""
+        with tracing.span('hr.dibujo', stars=len(self.calculated_results)):
+            if not update_hr_diagram(self.hr_figure, self.calculated_results):
+                fig = plot_hr_diagram(STANDARD_STARS, self.calculated_results, save_path=None)
+                # La figura nueva (10x8 in) toma el tamaño actual del lienzo, que
+                # solo se reajusta al redimensionar la ventana
+                fig.set_dpi(self.hr_figure.dpi)
+                fig.set_size_inches(self.hr_figure.get_size_inches(), forward=False)
+                plt.close(self.hr_figure)
+                self.hr_figure = fig
+                self.hr_canvas.figure = fig
+                fig.set_canvas(self.hr_canvas)
+            if tracing.is_enabled():
+                # Al medir, el dibujado se hace aquí para que entre en el intervalo
+                self.hr_canvas.draw()
+        if not tracing.is_enabled():
+            self.hr_canvas.draw_idle()
+    
+    def export_hr_diagram(self):
+        """Exporta el diagrama HR a 300 dpi sin bloquear la ventana"""
+        if self.hr_figure is None:
+            return
+        self.status_label.config(text="Exportando diagrama HR...")
+        export_hr_diagram(self.hr_figure,
+                          callback=lambda path, error: self._hr_export_queue.put((path, error)))
+        self.root.after(200, self._poll_hr_export)
+    
+    def _poll_hr_export(self):
+        """Comprueba (desde el hilo de Tk) si la exportación ha terminado"""
+        if not self.root.winfo_exists():
+            # Ventana cerrada: la exportación termina sola, sin avisos
+            return
+        try:
+            path, error = self._hr_export_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(200, self._poll_hr_export)
+            return
+        
+        if error is not None:
+            self.status_label.config(text=f"Error al exportar el diagrama HR: {error}")
+        else:
+            self.status_label.config(text=f"Diagrama HR guardado en: {path}")
+        self.update_trace_status()
     
     # Exportación tablas varios formatos
     def add_export_buttons(self, notebook, input_table, results_table):
@@ -152,32 +287,88 @@ class ResultsWindow:
                   command=lambda: self.export_tables(input_table, results_table, 'excel')).pack(side=tk.LEFT, padx=5)
     
     def export_tables(self, input_table, results_table, format_type):
-        """Exporta ambas tablas al formato especificado"""
-        # CSV, Latex, Excel
-        try:
-            # Crear directorio 'export' si no existe
-            export_dir = Path(__file__).parent.parent / "export"
+        """
+        Exporta ambas tablas al formato especificado en un hilo en segundo
+        plano, escribiendo por bloques de filas y mostrando el progreso
+        """
+        if self._table_export_thread is not None and self._table_export_thread.is_alive():
+            self.status_label.config(text="Ya hay una exportación de tablas en curso")
+            return
+        
+        # Crear directorio 'export' si no existe
+        export_dir = Path(__file__).parent.parent / "export"
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Las tablas se sustituyen (no se modifican) al añadir estrellas, pero
+        # stars_data es el StarStore al que add_star añade filas en su sitio:
+        # se copia aquí, en el hilo de Tk, para que entradas y resultados
+        # exportados tengan las mismas filas
+        stars_data = snapshot_rows(self.stars_data)
+        calculated_results = snapshot_rows(self.calculated_results)
+        
+        def progress(done, total):
+            self._table_export_queue.put(('progress', done, total))
+        
+        def write_files():
             export_dir.mkdir(exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
+            counter = ProgressCounter([input_table, results_table], progress)
+            # CSV, Excel, Parquet, Feather: valores numéricos a precisión completa;
+            # LaTeX: texto con los decimales de la tabla, formateado por bloques
             if format_type == 'csv':
-                input_table.to_csv(export_dir / f"datos_entrada_{timestamp}.csv", index=False, encoding='utf-8')
-                results_table.to_csv(export_dir / f"resultados_{timestamp}.csv", index=False, encoding='utf-8')
-                messagebox.showinfo("Éxito", f"Tablas exportadas a CSV en:\n{export_dir}")
-                
+                write_csv(input_table, export_dir / f"datos_entrada_{timestamp}.csv", counter=counter)
+                write_csv(results_table, export_dir / f"resultados_{timestamp}.csv", counter=counter)
             elif format_type == 'latex':
-                with open(export_dir / f"tablas_{timestamp}.tex", 'w', encoding='utf-8') as f:
-                    f.write("% Tabla de Datos de Entrada\n")
-                    f.write(input_table.to_latex(index=False, escape=False))
-                    f.write("\n\n% Tabla de Resultados\n")
-                    f.write(results_table.to_latex(index=False, escape=False))
-                messagebox.showinfo("Éxito", f"Tablas exportadas a LaTeX en:\n{export_dir}")
-                
+                write_latex([("Tabla de Datos de Entrada", input_table),
+                             ("Tabla de Resultados", results_table)],
+                            export_dir / f"tablas_{timestamp}.tex", formatter=format_table,
+                            counter=counter)
             elif format_type == 'excel':
-                with pd.ExcelWriter(export_dir / f"resultados_{timestamp}.xlsx") as writer:
-                    input_table.to_excel(writer, sheet_name='Datos Entrada', index=False)
-                    results_table.to_excel(writer, sheet_name='Resultados', index=False)
-                messagebox.showinfo("Éxito", f"Tablas exportadas a Excel en:\n{export_dir}")
+                write_excel([('Datos Entrada', input_table), ('Resultados', results_table)],
+                            export_dir / f"resultados_{timestamp}.xlsx", counter=counter)
+            elif format_type in ('parquet', 'feather'):
+                # Se exportan los datos numéricos, no las tablas formateadas
+                write_frame(stars_frame(stars_data),
+                            export_dir / f"datos_entrada_{timestamp}.{format_type}")
+                write_frame(results_frame(calculated_results),
+                            export_dir / f"resultados_{timestamp}.{format_type}")
+        
+        def worker():
+            try:
+                with tracing.span(f'exportacion.{format_type}', stars=len(results_table)):
+                    write_files()
+                self._table_export_queue.put(('done', format_type, None))
+            except Exception as e:
+                self._table_export_queue.put(('done', format_type, e))
+        
+        self.export_progress.config(value=0)
+        self.status_label.config(text=f"Exportando tablas ({format_type})...")
+        self._table_export_thread = threading.Thread(target=worker, daemon=True)
+        self._table_export_thread.start()
+        self.root.after(100, self._poll_table_export)
+    
+    def _poll_table_export(self):
+        """Muestra el progreso y el final de la exportación (desde el hilo de Tk)"""
+        if not self.root.winfo_exists():
+            return
+        try:
+            while True:
+                message = self._table_export_queue.get_nowait()
+                if message[0] == 'progress':
+                    _, done, total = message
+                    self.export_progress.config(value=100 * done / total if total else 100)
+                    continue
                 
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudieron exportar las tablas:\n{str(e)}")
+                _, format_type, error = message
+                export_dir = Path(__file__).parent.parent / "export"
+                if error is not None:
+                    self.status_label.config(text="Error al exportar las tablas")
+                    messagebox.showerror("Error", f"No se pudieron exportar las tablas:\n{str(error)}")
+                else:
+                    self.export_progress.config(value=100)
+                    self.status_label.config(text=f"Tablas exportadas en: {export_dir}")
+                    name = {'csv': 'CSV', 'latex': 'LaTeX', 'excel': 'Excel'}.get(
+                        format_type, format_type.capitalize())
+                    messagebox.showinfo("Éxito", f"Tablas exportadas a {name} en:\n{export_dir}")
+                self.update_trace_status()
+                return
+        except queue.Empty:
+            self.root.after(100, self._poll_table_export)
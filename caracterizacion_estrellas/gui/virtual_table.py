@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+# virtual_table.py
+import tkinter as tk
+from tkinter import ttk
+
+class VirtualTable:
+    """
+    Tabla virtual sobre un ttk.Treeview: solo se crean las filas visibles
+    (más un pequeño margen), que se leen del DataFrame al desplazarse.
+    El tiempo de apertura no depende del número de filas. Si se indica
+    formatter(bloque), se aplica solo a las filas que se muestran
+    """
+    def __init__(self, parent, dataframe, buffer_rows=5, column_width=100, formatter=None):
+        self.data = dataframe
+        self.formatter = formatter
+        self.buffer_rows = buffer_rows
+        self.first = 0      # Primera fila mostrada
+        self.visible = 20   # Filas que caben en pantalla (se recalcula)
+
+        style = ttk.Style()
+        self.row_height = int(style.lookup('Treeview', 'rowheight') or 20)
+
+        self.tree = ttk.Treeview(parent, show='headings', selectmode='browse')
+        self.tree["columns"] = list(dataframe.columns)
+        for col in dataframe.columns:
+            self.tree.column(col, anchor=tk.W, width=column_width)
+            self.tree.heading(col, text=col, anchor=tk.W)
+
+        # La barra de desplazamiento se controla a mano, no con tree.yview
+        self.scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self._on_scrollbar)
+
+        # Layout
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # Eventos
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(3))
+        self.tree.bind('<Prior>', lambda e: self.scroll(-self.visible) or 'break')
+        self.tree.bind('<Next>', lambda e: self.scroll(self.visible) or 'break')
+        self.tree.bind('<Home>', lambda e: self.scroll_to(0) or 'break')
+        self.tree.bind('<End>', lambda e: self.scroll_to(len(self.data)) or 'break')
+
+        self.render()
+
+    def set_data(self, dataframe):
+        """Sustituye los datos de la tabla manteniendo la posición"""
+        self.data = dataframe
+        self.render()
+
+    def scroll(self, rows):
+        """Desplaza la ventana visible un número de filas"""
+        self.scroll_to(self.first + rows)
+
+    def scroll_to(self, row):
+        """Sitúa la fila indicada al principio de la ventana visible"""
+        self.first = row
+        self.render()
+
+    def render(self):
+        """Materializa en el Treeview únicamente las filas de la ventana visible"""
+        total = len(self.data)
+        self.first = max(0, min(self.first, total - self.visible))
+
+        last = min(total, self.first + self.visible + self.buffer_rows)
+        window = self.data.iloc[self.first:last]
+        if self.formatter is not None:
+            window = self.formatter(window)
+        rows = window.to_numpy().tolist()
+
+        self.tree.delete(*self.tree.get_children())
+        for values in rows:
+            self.tree.insert("", tk.END, values=values)
+        self.tree.yview_moveto(0)
+
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self.visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_resize(self, event):
+        """Recalcula cuántas filas caben al cambiar el tamaño"""
+        # Se descuenta aproximadamente la altura de la cabecera
+        visible = max(1, event.height // self.row_height - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.render()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        """Traduce los comandos de la barra ('moveto' / 'scroll') a filas"""
+        if action == 'moveto':
+            self.scroll_to(int(float(value) * len(self.data)))
+        elif action == 'scroll':
+            step = self.visible if unit == 'pages' else 1
+            self.scroll(int(value) * step)
+
+    def _on_mousewheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+        return 'break'
@@ -1,42 +1,137 @@
-import tkinter as tk
-from gui.main_window import StarInputForm
-from gui.results_window import ResultsWindow
+import argparse
 from src.star_data import *
+from src import tracing
 
 def main():
+    import tkinter as tk
+    from gui.main_window import StarInputForm
+    from src.results_model import ResultsModel
+    
     root = tk.Tk()
     
+    # Resultados memoizados y ventana de resultados abierta (si la hay)
+    results_model = ResultsModel()
+    results_view = {'window': None}
+    
+    def results_window_open():
+        view = results_view['window']
+        return view is not None and view.root.winfo_exists()
+    
     def process_stars_data(stars_data):
-        # Realizar cálculos
-        calculated_results = []
-        for star in stars_data:
-            delta_time = (star['date2'] - star['date1']).days / 365.25
-            
-            # Cálculos
-            mov_propio = calculate_proper_motion(star['angular_displacement'], delta_time)
-            distancia = calculate_distance(star['parallax'])
-            b_v = calculate_spectral_index(star['B'], star['V'])
-            mv = calculate_absolute_magnitude(star['V'], distancia)
-            vt = calculate_tangential_velocity(mov_propio, distancia)
-            v_total = calculate_total_velocity(star['vr'], vt)
-            
-            calculated_results.append({
-                'Nombre': star['name'],
-                'Mov_propio': mov_propio,
-                'Distancia': distancia,
-                'B-V': b_v,
-                'Mv': mv,
-                'Vt': vt,
-                'V_total': v_total
-            })
+        # Solo se calculan las estrellas nuevas o editadas
+        with tracing.span('calculos', stars=len(stars_data)):
+            diff = results_model.update(stars_data)
         
-        # Mostrar ventana de resultados
-        results_window = tk.Toplevel(root)
-        ResultsWindow(results_window, stars_data, calculated_results)
+        if results_window_open():
+            # Se actualiza la ventana existente en lugar de crear otra
+            results_view['window'].update_results(stars_data, diff['results'], diff)
+            results_view['window'].root.lift()
+        else:
+            # matplotlib y pandas se cargan al abrir los resultados
+            from gui.results_window import ResultsWindow
+            
+            # Mostrar ventana de resultados
+            results_window = tk.Toplevel(root)
+            results_view['window'] = ResultsWindow(results_window, stars_data, diff['results'])
+    
+    def refresh_results(stars_data):
+        # Resultados en vivo: al añadir estrellas con la ventana ya abierta
+        if results_window_open():
+            process_stars_data(stars_data)
     
     # Mostrar formulario principal
-    app = StarInputForm(root, process_stars_data)
+    app = StarInputForm(root, process_stars_data, on_change_callback=refresh_results)
     root.mainloop()
 
+def positive_float(value):
+    """Tipo de argparse: número real mayor que cero"""
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"debe ser mayor que 0: {value}")
+    return number
+
+def parse_args(argv=None):
+    """Argumentos de línea de comandos (modo por lotes sin interfaz gráfica)"""
+    parser = argparse.ArgumentParser(
+        description="Caracterización de estrellas. Sin argumentos abre la interfaz gráfica.")
+    parser.add_argument('--batch', metavar='CATALOGO',
+                        help="Procesa un catálogo CSV/ECSV sin interfaz gráfica")
+    parser.add_argument('--output-dir', default='export',
+                        help="Directorio de salida del modo por lotes (por defecto: export)")
+    parser.add_argument('--simbad', action='store_true',
+                        help="Completa los valores ausentes consultando SIMBAD")
+    parser.add_argument('--no-plot', action='store_true',
+                        help="No genera el diagrama HR")
+    parser.add_argument('--classify', action='store_true',
+                        help="Añade la clasificación espectral y la distancia espectroscópica")
+    parser.add_argument('--monte-carlo', type=int, default=0, metavar='N',
+                        help="Propaga las incertidumbres (columnas e_*) con N muestras por estrella")
+    parser.add_argument('--workers', type=int, metavar='N',
+                        help="Reparte el cálculo y la clasificación en N procesos")
+    parser.add_argument('--chunk-size', type=int, metavar='N',
+                        help="Procesa el catálogo en bloques de N estrellas con memoria "
+                             "constante (sin diagrama HR)")
+    parser.add_argument('--simbad-record', metavar='DIR',
+                        help="Graba las respuestas de SIMBAD en DIR (ficheros ECSV)")
+    parser.add_argument('--simbad-replay', metavar='DIR',
+                        help="Responde a las consultas con las grabaciones de DIR, sin red")
+    parser.add_argument('--simbad-timeout', type=float, metavar='S',
+                        help="Tiempo máximo de cada petición a SIMBAD en segundos (por defecto 60; "
+                             "no se admite con --simbad-replay)")
+    parser.add_argument('--simbad-retries', type=int, metavar='N',
+                        help="Reintentos ante errores de red de SIMBAD (por defecto 3)")
+    parser.add_argument('--simbad-rate', type=positive_float, metavar='R',
+                        help="Máximo de consultas a SIMBAD por segundo (por defecto 5)")
+    parser.add_argument('--trace', metavar='FICHERO',
+                        help="Mide el tiempo de cada etapa y guarda la traza (formato Chrome trace)")
+    parser.add_argument('--import-report', action='store_true',
+                        help="Muestra los tiempos de importación frente al presupuesto de arranque")
+    args = parser.parse_args(argv)
+    if args.simbad_replay and args.simbad_timeout is not None:
+        # Las grabaciones se leen de disco: no hay petición a la que aplicar el tiempo máximo
+        parser.error("--simbad-timeout no tiene efecto con --simbad-replay")
+    return args
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    if args.trace:
+        tracing.enable(args.trace)
+    if (args.simbad_timeout is not None or args.simbad_retries is not None
+            or args.simbad_rate is not None):
+        from src.simbad_client import configure_client
+        from src.simbad_scheduler import RequestScheduler
+        options = {} if args.simbad_retries is None else {'retries': args.simbad_retries}
+        if args.simbad_rate is not None:
+            options['scheduler'] = RequestScheduler(rate=args.simbad_rate,
+                                                    burst=max(1, int(args.simbad_rate)))
+        configure_client(timeout=args.simbad_timeout, **options)
+    if args.simbad_record or args.simbad_replay:
+        from src.simbad_client import AstroqueryTransport, DEFAULT_TIMEOUT, set_transport
+        from src.simbad_transport import RecordingTransport, ReplayTransport
+        if args.simbad_replay:
+            set_transport(ReplayTransport(args.simbad_replay))
+        else:
+            # Se conserva el tiempo máximo de --simbad-timeout al grabar
+            timeout = args.simbad_timeout if args.simbad_timeout is not None else DEFAULT_TIMEOUT
+            set_transport(RecordingTransport(AstroqueryTransport(timeout=timeout),
+                                             args.simbad_record))
+    
+    if args.import_report:
+        from src.import_report import main as import_report_main
+        raise SystemExit(import_report_main([]))
+    elif args.batch and args.chunk_size:
+        from src.batch import run_batch_streaming
+        run_batch_streaming(args.batch, args.output_dir, use_simbad=args.simbad,
+                            chunk_size=args.chunk_size, classify=args.classify,
+                            monte_carlo=args.monte_carlo, workers=args.workers)
+    elif args.batch:
+        from src.batch import run_batch
+        run_batch(args.batch, args.output_dir, use_simbad=args.simbad,
+                  plot=not args.no_plot, classify=args.classify, monte_carlo=args.monte_carlo,
+                  workers=args.workers)
+    else:
+        main()
+    
+    if args.trace:
+        print(f"Tiempos por etapa: {tracing.summary()}")
+        print(f"Traza guardada en: {args.trace}")
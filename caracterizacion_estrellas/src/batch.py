@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+
+# batch.py
+# Procesamiento de catálogos sin interfaz gráfica (no importa tkinter)
+from datetime import datetime
+from pathlib import Path
+import pandas as pd
+from src.star_data import CLASSIFICATION_COLUMNS, calculate_batch_dataframe, classify_batch
+from src.tracing import span
+
+# Formatos columnares (mismas extensiones que src.columnar_io, sin importar pyarrow)
+ARROW_SUFFIXES = ('.parquet', '.feather', '.arrow')
+
+# Campos que recoge StarInputForm.add_star
+INPUT_COLUMNS = ['name', 'angular_displacement', 'date1', 'date2',
+                 'parallax', 'vr', 'B', 'V']
+# Tamaño de bloque por defecto del modo por bloques (streaming)
+DEFAULT_CHUNK_SIZE = 50000
+# Campos que se pueden completar con SIMBAD
+SIMBAD_COLUMNS = {
+    'vr': 'radial_velocity_km_s',
+    'parallax': 'parallax_arcsec',
+    'B': 'mag_B',
+    'V': 'mag_V'
+}
+
+def read_catalog(path):
+    """Lee un catálogo de estrellas en CSV, ECSV, Parquet o Feather"""
+    path = Path(path)
+    if path.suffix.lower() == '.ecsv':
+        from astropy.table import Table
+        df = Table.read(path, format='ascii.ecsv').to_pandas()
+    elif path.suffix.lower() in ARROW_SUFFIXES:
+        from src.columnar_io import read_frame
+        df = read_frame(path)
+    else:
+        df = pd.read_csv(path)
+    return prepare_catalog(df, path.name)
+
+def prepare_catalog(df, source_name=''):
+    """Comprueba las columnas y convierte los tipos de un bloque del catálogo"""
+    missing = [col for col in INPUT_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Faltan columnas en {source_name}: {', '.join(missing)}")
+
+    df['name'] = df['name'].astype(str).str.strip()
+    df['date1'] = pd.to_datetime(df['date1'])
+    df['date2'] = pd.to_datetime(df['date2'])
+    for col in ['angular_displacement'] + list(SIMBAD_COLUMNS):
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    df['delta_time'] = (df['date2'] - df['date1']).dt.days / 365.25
+    return df
+
+def enrich_from_simbad(df):
+    """Completa con SIMBAD los valores ausentes de Vr, paralaje, B y V"""
+    from src.simbad_client import query_simbad_batch
+
+    incomplete = df[list(SIMBAD_COLUMNS)].isna().any(axis=1)
+    if not incomplete.any():
+        return df
+
+    simbad_data = query_simbad_batch(df.loc[incomplete, 'name'].tolist())
+    for col, field in SIMBAD_COLUMNS.items():
+        values = df['name'].map(
+            lambda name: (simbad_data.get(name) or {}).get(field))
+        df[col] = df[col].fillna(pd.to_numeric(values, errors='coerce'))
+    return df
+
+def iter_catalog(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Lee el catálogo (CSV, ECSV, Parquet o Feather) en bloques de chunk_size filas
+    Yields:
+        DataFrame: Bloque ya preparado con prepare_catalog
+    """
+    path = Path(path)
+    if path.suffix.lower() in ARROW_SUFFIXES:
+        from src.columnar_io import iter_frames
+        for chunk in iter_frames(path, chunk_size):
+            yield prepare_catalog(chunk, path.name)
+        return
+    
+    options = {}
+    if path.suffix.lower() == '.ecsv':
+        # ECSV: cabecera YAML en comentarios y datos en texto delimitado
+        options = {'comment': '#', 'sep': _ecsv_delimiter(path)}
+    
+    with pd.read_csv(path, chunksize=chunk_size, **options) as reader:
+        for chunk in reader:
+            yield prepare_catalog(chunk, path.name)
+
+def _ecsv_delimiter(path):
+    """Delimitador declarado en la cabecera ECSV (espacio por defecto)"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.startswith('#'):
+                break
+            if line.lstrip('# ').startswith('delimiter:'):
+                return line.split(':', 1)[1].strip().strip("'\"") or ' '
+    return ' '
+
+def process_chunks(chunks, use_simbad=False, workers=None, classify=False):
+    """
+    Aplica SIMBAD (opcional), validación y cálculos a cada bloque. Con
+    workers, cada bloque se reparte en varios procesos (y se clasifica allí
+    mismo si classify)
+    Yields:
+        tuple: (datos de entrada, resultados) del bloque como DataFrames
+    """
+    if workers:
+        from src.parallel import calculate_parallel_dataframe
+    for chunk in chunks:
+        if use_simbad:
+            chunk = enrich_from_simbad(chunk)
+        chunk = validate_catalog(chunk)
+        if not len(chunk):
+            continue
+        if workers:
+            yield chunk, calculate_parallel_dataframe(chunk, workers, classify)
+        else:
+            yield chunk, calculate_batch_dataframe(chunk)
+
+def classification_table(stars, results):
+    """Tabla de clasificación respecto a la secuencia principal"""
+    if all(col in results.columns for col in CLASSIFICATION_COLUMNS):
+        # Ya calculada en los procesos de calculate_parallel_dataframe
+        return results[['Nombre'] + CLASSIFICATION_COLUMNS]
+    classification = classify_batch(results['B-V'].to_numpy(), results['Mv'].to_numpy(),
+                                    stars['V'].to_numpy())
+    return pd.DataFrame({'Nombre': stars['name'].to_numpy(), **classification})
+
+def write_tables_streaming(processed_chunks, input_path, results_path, classification_path=None,
+                           uncertainties_path=None, monte_carlo=0):
+    """
+    Escribe las tablas de visualization/tables.py bloque a bloque en CSV
+    (y la de clasificación si se indica classification_path, y los percentiles
+    de Monte Carlo con monte_carlo muestras si se indica uncertainties_path)
+    Returns:
+        int: Número de estrellas escritas
+    """
+    from visualization.tables import create_input_table, create_results_table
+    
+    total = 0
+    first = True
+    for stars, results in processed_chunks:
+        mode = 'w' if first else 'a'
+        create_input_table(stars).to_csv(
+            input_path, mode=mode, header=first, index=False, encoding='utf-8')
+        create_results_table(results).to_csv(
+            results_path, mode=mode, header=first, index=False, encoding='utf-8')
+        if classification_path is not None:
+            classification_table(stars, results).to_csv(
+                classification_path, mode=mode, header=first, index=False, encoding='utf-8')
+        if uncertainties_path is not None and monte_carlo:
+            # Cada estrella se propaga por separado: se puede hacer por bloques
+            from src.uncertainty import propagate_dataframe
+            propagate_dataframe(stars, samples=monte_carlo).to_csv(
+                uncertainties_path, mode=mode, header=first, index=False, encoding='utf-8')
+        total += len(stars)
+        first = False
+    return total
+
+def validate_catalog(df):
+    """Descarta (avisando) las estrellas con datos incompletos o no válidos"""
+    valid = (df[['angular_displacement'] + list(SIMBAD_COLUMNS)].notna().all(axis=1)
+             & (df['delta_time'] > 0))
+    if not valid.all():
+        print(f"Se descartan {int((~valid).sum())} estrellas con datos incompletos: "
+              f"{', '.join(df.loc[~valid, 'name'])}")
+    return df[valid].reset_index(drop=True)
+
+def run_batch(input_path, output_dir, use_simbad=False, plot=True, classify=False,
+              monte_carlo=0, workers=None):
+    """
+    Procesa un catálogo completo: lectura, SIMBAD (opcional), cálculos,
+    tablas, clasificación espectral (opcional), incertidumbres por Monte
+    Carlo (monte_carlo muestras por estrella, opcional) y diagrama HR.
+    Con workers, el cálculo y la clasificación se reparten en varios procesos
+    Returns:
+        dict: Rutas de los ficheros generados
+    """
+    from visualization.tables import create_input_table, create_results_table
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    with span('lectura'):
+        df = read_catalog(input_path)
+    if use_simbad:
+        df = enrich_from_simbad(df)
+    df = validate_catalog(df)
+
+    with span('calculos', stars=len(df)):
+        if workers:
+            from src.parallel import calculate_parallel_dataframe
+            results = calculate_parallel_dataframe(df, workers, classify)
+        else:
+            results = calculate_batch_dataframe(df)
+
+    outputs = {
+        'input': output_dir / f"datos_entrada_{timestamp}.csv",
+        'results': output_dir / f"resultados_{timestamp}.csv"
+    }
+    with span('tablas', stars=len(df)):
+        input_table, results_table = create_input_table(df), create_results_table(results)
+    with span('exportacion.csv', stars=len(df)):
+        input_table.to_csv(outputs['input'], index=False, encoding='utf-8')
+        results_table.to_csv(outputs['results'], index=False, encoding='utf-8')
+    if classify:
+        outputs['classification'] = output_dir / f"clasificacion_{timestamp}.csv"
+        classification_table(df, results).to_csv(outputs['classification'], index=False,
+                                                 encoding='utf-8')
+    if monte_carlo:
+        from src.uncertainty import propagate_dataframe
+        outputs['uncertainties'] = output_dir / f"incertidumbres_{timestamp}.csv"
+        propagate_dataframe(df, samples=monte_carlo).to_csv(outputs['uncertainties'], index=False,
+                                                            encoding='utf-8')
+
+    if plot:
+        # Backend sin pantalla para servidores
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        from src.star_data import STANDARD_STARS
+        from visualization.hr_diagram import plot_hr_diagram
+
+        outputs['hr_diagram'] = output_dir / f"hr_diagram_{timestamp}.png"
+        with span('hr.dibujo', stars=len(df)):
+            fig = plot_hr_diagram(STANDARD_STARS, results,
+                                  save_path=str(outputs['hr_diagram']))
+        plt.close(fig)
+
+    print(f"Procesadas {len(df)} estrellas. Resultados en: {output_dir}")
+    return outputs
+
+def run_batch_streaming(input_path, output_dir, use_simbad=False,
+                        chunk_size=DEFAULT_CHUNK_SIZE, classify=False, monte_carlo=0,
+                        workers=None):
+    """
+    Versión por bloques de run_batch: la memoria depende de chunk_size y no
+    del tamaño del catálogo. No genera el diagrama HR, que necesita todos
+    los puntos a la vez
+    Returns:
+        dict: Rutas de los ficheros generados
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    
+    outputs = {
+        'input': output_dir / f"datos_entrada_{timestamp}.csv",
+        'results': output_dir / f"resultados_{timestamp}.csv"
+    }
+    if classify:
+        outputs['classification'] = output_dir / f"clasificacion_{timestamp}.csv"
+    if monte_carlo:
+        outputs['uncertainties'] = output_dir / f"incertidumbres_{timestamp}.csv"
+    chunks = iter_catalog(input_path, chunk_size)
+    total = write_tables_streaming(process_chunks(chunks, use_simbad, workers, classify),
+                                   outputs['input'], outputs['results'],
+                                   outputs.get('classification'),
+                                   outputs.get('uncertainties'), monte_carlo)
+    
+    print(f"Procesadas {total} estrellas. Resultados en: {output_dir}")
+    return outputs
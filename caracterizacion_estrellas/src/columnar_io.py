@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+# columnar_io.py
+# Exportación/importación Parquet y Arrow IPC (Feather) con columnas numéricas
+# a precisión completa. Requiere pyarrow (se importa solo al usarlo)
+from pathlib import Path
+import pandas as pd
+from src.star_data import as_array, is_structured, RESULT_COLUMNS
+from src.star_store import STAR_DTYPE, StarStore
+
+ARROW_SUFFIXES = {'.parquet': 'parquet', '.feather': 'feather', '.arrow': 'feather'}
+
+def _pyarrow():
+    """Importa pyarrow con un mensaje claro si no está instalado"""
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("La exportación Parquet/Arrow necesita pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+def stars_frame(stars_data):
+    """DataFrame numérico (sin formatear) de los datos de entrada"""
+    if is_structured(stars_data):
+        data = as_array(stars_data)
+        return pd.DataFrame({field: data[field] for field in STAR_DTYPE.names})
+    return StarStore.from_records(stars_data).to_dataframe()
+
+def results_frame(calculated_results):
+    """DataFrame numérico (sin formatear) de los resultados calculados"""
+    if is_structured(calculated_results):
+        data = as_array(calculated_results)
+        return pd.DataFrame({field: data[field] for field in data.dtype.names})
+    return pd.DataFrame(list(calculated_results), columns=['Nombre'] + RESULT_COLUMNS)
+
+def write_frame(df, path):
+    """Escribe un DataFrame en Parquet o Feather según la extensión"""
+    pa = _pyarrow()
+    path = Path(path)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if ARROW_SUFFIXES.get(path.suffix.lower()) == 'parquet':
+        pa.parquet.write_table(table, path)
+    else:
+        # Sin compresión para poder leerlo después mapeado en memoria sin copias
+        pa.feather.write_feather(table, path, compression='uncompressed')
+    return path
+
+def read_table(path):
+    """Lee un fichero Parquet/Feather como tabla de Arrow mapeada en memoria"""
+    pa = _pyarrow()
+    path = Path(path)
+    if ARROW_SUFFIXES.get(path.suffix.lower()) == 'parquet':
+        return pa.parquet.read_table(path, memory_map=True)
+    return pa.feather.read_table(path, memory_map=True)
+
+def read_columns(path):
+    """
+    Columnas de un fichero Parquet/Feather como arrays de NumPy. En Feather
+    sin compresión, las columnas numéricas sin nulos son vistas del mapa de
+    memoria (sin copia)
+    """
+    table = read_table(path)
+    columns = {}
+    for name in table.column_names:
+        column = table.column(name)
+        if column.num_chunks == 1:
+            column = column.chunk(0)
+        columns[name] = column.to_numpy(zero_copy_only=False)
+    return columns
+
+def read_frame(path):
+    """Lee un fichero Parquet/Feather como DataFrame"""
+    return read_table(path).to_pandas()
+
+def iter_frames(path, chunk_size):
+    """Lee un fichero Parquet/Feather en bloques de chunk_size filas"""
+    pa = _pyarrow()
+    path = Path(path)
+    if ARROW_SUFFIXES.get(path.suffix.lower()) == 'parquet':
+        batches = pa.parquet.ParquetFile(path, memory_map=True).iter_batches(batch_size=chunk_size)
+        for batch in batches:
+            yield batch.to_pandas()
+    else:
+        # El fichero está mapeado en memoria: cada bloque es una porción de él
+        table = read_table(path)
+        for start in range(0, table.num_rows, chunk_size):
+            yield table.slice(start, chunk_size).to_pandas()
+
+def load_stars(path):
+    """
+    Carga los datos de entrada exportados (Parquet/Feather) como StarStore,
+    sin pasar por texto: en Feather las columnas se leen del mapa de memoria
+    """
+    columns = read_columns(path)
+    missing = [field for field in STAR_DTYPE.names if field not in columns]
+    if missing:
+        raise ValueError(f"Faltan columnas en {Path(path).name}: {', '.join(missing)}")
+    return StarStore.from_columns(columns)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+# import_report.py
+# Informe de tiempos de importación en frío (cada módulo en un intérprete nuevo)
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Módulos que se cargan al arrancar la interfaz
+STARTUP_MODULES = ['main', 'gui.main_window', 'src.results_model']
+# Módulos pesados que se cargan bajo demanda
+LAZY_MODULES = ['src.simbad_client', 'gui.results_window', 'visualization.hr_diagram',
+                'src.columnar_io', 'src.batch']
+# Presupuesto de arranque en segundos (módulos de STARTUP_MODULES juntos)
+STARTUP_BUDGET_S = 0.5
+
+APP_DIR = Path(__file__).parent.parent
+
+def measure_import(modules):
+    """
+    Tiempo de importación acumulado (s) de los módulos indicados en un
+    intérprete nuevo, usando python -X importtime
+    """
+    modules = [modules] if isinstance(modules, str) else list(modules)
+    code = '; '.join(f'import {module}' for module in modules)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=APP_DIR, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {', '.join(modules)}:\n{proc.stderr[-2000:]}")
+
+    # Líneas 'import time: self [us] | cumulative | imported package'
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        times[parts[2].strip()] = int(parts[1]) / 1e6
+    return sum(times.get(module, 0.0) for module in modules)
+
+def import_report(budget=STARTUP_BUDGET_S):
+    """Mide el arranque y los módulos diferidos y lo compara con el presupuesto"""
+    report = {
+        'startup_s': measure_import(STARTUP_MODULES),
+        'budget_s': budget,
+        'lazy_modules_s': {module: measure_import(module) for module in LAZY_MODULES}
+    }
+    report['within_budget'] = report['startup_s'] <= budget
+    return report
+
+def main(argv=None):
+    """Punto de entrada: python -m src.import_report [--budget S] [--json FICHERO]"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Informe de tiempos de importación")
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET_S,
+                        help="Presupuesto de arranque en segundos")
+    parser.add_argument('--json', metavar='FICHERO', help="Guarda el informe en JSON")
+    args = parser.parse_args(argv)
+
+    report = import_report(args.budget)
+    print(f"Arranque ({', '.join(STARTUP_MODULES)}): {report['startup_s']:.3f} s "
+          f"(presupuesto {report['budget_s']:.3f} s) -> "
+          f"{'OK' if report['within_budget'] else 'EXCEDIDO'}")
+    for module, seconds in report['lazy_modules_s'].items():
+        print(f"  bajo demanda {module}: {seconds:.3f} s")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0 if report['within_budget'] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
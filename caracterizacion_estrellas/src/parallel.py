@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+# parallel.py
+# Cálculo y clasificación de catálogos grandes en varios núcleos. Las columnas
+# de entrada y de salida viven en un bloque de multiprocessing.shared_memory:
+# cada proceso calcula su tramo de filas y escribe el resultado en su sitio,
+# de modo que entre procesos solo viajan los límites de cada tramo
+import os
+from multiprocessing import get_all_start_methods, get_context
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+from src.star_data import (CLASSIFICATION_COLUMNS, RESULT_COLUMNS, calculate_batch,
+                           classify_batch, stars_to_columns)
+
+INPUT_LAYOUT = [(field, 'f8') for field in
+                ('angular_displacement', 'delta_time', 'parallax', 'B', 'V', 'vr')]
+RESULT_LAYOUT = [(col, 'f8') for col in RESULT_COLUMNS]
+# El subtipo espectral cabe en 2 caracteres (SPECTRAL_LABELS)
+CLASSIFICATION_LAYOUT = [(col, 'U2' if col == 'Tipo_espectral' else 'f8')
+                         for col in CLASSIFICATION_COLUMNS]
+# Tramos por proceso (varios para repartir mejor la carga) y filas mínimas por tramo
+TASKS_PER_WORKER = 4
+MIN_TASK_ROWS = 10000
+
+class SharedColumns:
+    """
+    Columnas de NumPy de n filas guardadas una tras otra en un único bloque
+    de memoria compartida. Se crea en el proceso principal y los procesos
+    del pool se conectan a él con SharedColumns.attach(spec)
+    Args:
+        layout: Lista de (nombre, dtype) de las columnas
+        n: Número de filas
+        name: Nombre de un bloque existente (None crea uno nuevo)
+    """
+    def __init__(self, layout, n, name=None):
+        self.layout = [(field, np.dtype(dtype)) for field, dtype in layout]
+        self.n = n
+        offsets = []
+        size = 0
+        for _, dtype in self.layout:
+            offsets.append(size)
+            # Cada columna alineada a 8 bytes
+            size += -(-dtype.itemsize * n // 8) * 8
+        self.shm = SharedMemory(name=name, create=name is None, size=max(size, 1))
+        self.columns = {field: np.ndarray((n,), dtype=dtype, buffer=self.shm.buf, offset=offset)
+                        for (field, dtype), offset in zip(self.layout, offsets)}
+
+    @property
+    def spec(self):
+        """Descripción del bloque que se envía a los procesos (sin los datos)"""
+        return self.shm.name, [(field, dtype.str) for field, dtype in self.layout], self.n
+
+    @classmethod
+    def attach(cls, spec):
+        name, layout, n = spec
+        return cls(layout, n, name=name)
+
+    def __getitem__(self, field):
+        return self.columns[field]
+
+    def copy(self):
+        """Copia de las columnas en memoria normal (siguen válidas tras close)"""
+        return {field: column.copy() for field, column in self.columns.items()}
+
+    def close(self, unlink=False):
+        # Las vistas deben liberarse antes de cerrar el bloque
+        self.columns = {}
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+# Bloques a los que está conectado cada proceso del pool
+_worker = {}
+
+def _attach_worker(input_spec, output_spec, classify):
+    """Inicializador de los procesos del pool"""
+    _worker['input'] = SharedColumns.attach(input_spec)
+    _worker['output'] = SharedColumns.attach(output_spec)
+    _worker['classify'] = classify
+
+def _compute_range(bounds):
+    """Calcula las filas [start, stop) y escribe el resultado en memoria compartida"""
+    start, stop = bounds
+    _compute_into(_worker['input'], _worker['output'], start, stop, _worker['classify'])
+    return stop - start
+
+def _compute_into(inputs, outputs, start, stop, classify):
+    """Calcula (y clasifica) un tramo de filas de inputs y lo guarda en outputs"""
+    rows = slice(start, stop)
+    result = calculate_batch(inputs['angular_displacement'][rows], inputs['delta_time'][rows],
+                             inputs['parallax'][rows], inputs['B'][rows],
+                             inputs['V'][rows], inputs['vr'][rows])
+    if classify:
+        result.update(classify_batch(result['B-V'], result['Mv'], inputs['V'][rows]))
+    for field, values in result.items():
+        outputs[field][rows] = values
+
+def task_bounds(n, workers, min_rows=MIN_TASK_ROWS):
+    """Tramos (start, stop) en que se reparten n filas entre workers procesos"""
+    tasks = max(1, min(workers * TASKS_PER_WORKER, n // max(min_rows, 1)))
+    edges = np.linspace(0, n, tasks + 1).astype(np.int64)
+    return [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+
+def calculate_parallel(stars_data, workers=None, classify=False, min_rows=MIN_TASK_ROWS):
+    """
+    Versión multiproceso de calculate_batch (y de classify_batch si classify)
+    Args:
+        stars_data: StarStore, array estructurado, lista de add_star o
+            diccionario de columnas (como stars_to_columns)
+        workers: Número de procesos (por defecto, todos los núcleos). Con
+            1 se calcula en el propio proceso, sin pool
+        classify: Añade también las columnas de classify_batch
+        min_rows: Filas mínimas por tramo
+    Returns:
+        dict: Columnas de RESULT_COLUMNS (y de la clasificación) como arrays
+    """
+    columns = stars_data if isinstance(stars_data, dict) else stars_to_columns(stars_data)
+    n = len(columns['angular_displacement'])
+    workers = max(1, workers or os.cpu_count() or 1)
+    output_layout = RESULT_LAYOUT + (CLASSIFICATION_LAYOUT if classify else [])
+
+    inputs = SharedColumns(INPUT_LAYOUT, n)
+    outputs = SharedColumns(output_layout, n)
+    try:
+        for field, _ in INPUT_LAYOUT:
+            inputs[field][:] = columns[field]
+
+        bounds = task_bounds(n, workers, min_rows)
+        if workers == 1 or len(bounds) <= 1:
+            for start, stop in bounds:
+                _compute_into(inputs, outputs, start, stop, classify)
+        else:
+            # fork evita volver a importar el programa en cada proceso donde existe
+            method = 'fork' if 'fork' in get_all_start_methods() else None
+            with get_context(method).Pool(min(workers, len(bounds)), initializer=_attach_worker,
+                                          initargs=(inputs.spec, outputs.spec, classify)) as pool:
+                for _ in pool.imap_unordered(_compute_range, bounds):
+                    pass
+        return outputs.copy()
+    finally:
+        inputs.close(unlink=True)
+        outputs.close(unlink=True)
+
+def calculate_parallel_dataframe(df, workers=None, classify=False):
+    """
+    calculate_parallel para un DataFrame con las columnas de add_star y
+    'delta_time'. Devuelve un DataFrame con 'Nombre' y las columnas calculadas
+    """
+    import pandas as pd
+
+    columns = {field: df[field].to_numpy(dtype=np.float64) for field, _ in INPUT_LAYOUT}
+    result = pd.DataFrame(calculate_parallel(columns, workers, classify), index=df.index)
+    result.insert(0, 'Nombre', df['name'])
+    return result
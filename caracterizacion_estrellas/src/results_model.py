@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+# results_model.py
+import numpy as np
+from src.star_data import calculate_stars, is_structured, RESULT_DTYPE
+
+# Campos de entrada que determinan los resultados de una estrella
+INPUT_FIELDS = ('name', 'angular_displacement', 'date1', 'date2',
+                'parallax', 'vr', 'B', 'V')
+
+def star_key(star):
+    """Clave (hashable) de una estrella a partir de sus datos de entrada"""
+    return tuple(star[field] for field in INPUT_FIELDS)
+
+class ResultsModel:
+    """
+    Modelo de resultados con memoización: solo se calculan las estrellas
+    nuevas o editadas desde la última actualización
+    """
+    def __init__(self):
+        self._results = {}  # clave -> resultado calculado
+        self.keys = []      # claves en el orden actual de las estrellas
+
+    def update(self, stars_data):
+        """
+        Actualiza el modelo con la lista completa de estrellas
+        Returns:
+            dict: 'results' (resultados en el orden de stars_data; array
+                RESULT_DTYPE si stars_data es un StarStore),
+                'added' (índices de las filas que hay que añadir o rehacer en
+                las tablas; si appended_only, todas las añadidas al final,
+                aunque repitan una estrella ya calculada),
+                'removed' (número de filas que ya no están) y
+                'appended_only' (True si solo se han añadido filas al final)
+        """
+        keys = [star_key(star) for star in stars_data]
+        # Filas sin resultado memoizado (las únicas que se calculan)
+        missing = [i for i, key in enumerate(keys) if key not in self._results]
+
+        # Cálculo vectorizado únicamente de lo nuevo
+        structured = is_structured(stars_data)
+        new_stars = stars_data[missing] if structured else [stars_data[i] for i in missing]
+        for i, result in zip(missing, calculate_stars(new_stars)):
+            self._results[keys[i]] = result
+
+        old_keys = self.keys
+        current = set(keys)
+        removed = sum(1 for key in old_keys if key not in current)
+        appended_only = keys[:len(old_keys)] == old_keys
+        # Una estrella repetida al final no se recalcula, pero sí es una fila nueva
+        added = list(range(len(old_keys), len(keys))) if appended_only else missing
+
+        # Se olvidan los resultados de estrellas eliminadas o editadas
+        for key in set(self._results) - current:
+            del self._results[key]
+        self.keys = keys
+
+        results = [self._results[key] for key in keys]
+        if structured:
+            results = np.array(results, dtype=RESULT_DTYPE)
+
+        return {
+            'results': results,
+            'added': added,
+            'removed': removed,
+            'appended_only': appended_only
+        }
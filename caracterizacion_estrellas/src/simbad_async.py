@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+# simbad_async.py
+# Consultas a SIMBAD con asyncio para listas que no se pueden agrupar en una
+# sola query_objects (tipos de identificador mezclados, consultas de detalle
+# por objeto): hasta K peticiones a la vez, cada una con su plazo, y
+# resultados entregados en cuanto llegan:
+#
+#   async for name, data, error in query_simbad_async(nombres, concurrency=8):
+#       ...
+#
+# Cada petición se hace con query_simbad en un hilo, así que pasa por la
+# misma caché, el mismo planificador de ritmo y los mismos reintentos
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from src.simbad_cache import normalize_identifier
+from src.simbad_client import _get_cache, query_simbad
+from src.simbad_retry import SimbadError
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_DEADLINE = 120.0  # Plazo por petición (s), incluidos los reintentos
+
+async def query_simbad_async(star_names, concurrency=DEFAULT_CONCURRENCY,
+                             deadline=DEFAULT_DEADLINE, use_cache=True, cache=None):
+    """
+    Consulta concurrente a SIMBAD (query_object por estrella)
+    Args:
+        star_names: Nombres de las estrellas
+        concurrency: Peticiones simultáneas como máximo (K)
+        deadline: Tiempo máximo de cada petición en segundos (None: sin plazo),
+            contado desde que tiene plaza; incluye la espera de turno en el
+            planificador compartido, que limita el ritmo de todo el programa
+        use_cache, cache: Igual que en query_simbad
+    Yields:
+        tuple: (nombre, datos o None, error o None), en orden de llegada. Los
+            nombres del mismo objeto se consultan una vez y se entregan juntos
+    """
+    unique_names = list(dict.fromkeys(name.strip() for name in star_names if name.strip()))
+    cache = _get_cache(use_cache, cache)
+    keys = (cache.canonical_ids(unique_names) if cache is not None
+            else [normalize_identifier(name) for name in unique_names])
+    groups = {}
+    for name, key in zip(unique_names, keys):
+        groups.setdefault(key, []).append(name)
+    if not groups:
+        return
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    # Hilos propios, uno por plaza: una petición que agota su plazo conserva
+    # hilo y plaza hasta que el transporte corta, de modo que las siguientes no
+    # esperan detrás de ella con el plazo ya en marcha
+    executor = ThreadPoolExecutor(max_workers=concurrency,
+                                  thread_name_prefix='simbad-async')
+
+    def release(_):
+        """Libera la plaza cuando el hilo termina de verdad (no al agotar el plazo)"""
+        try:
+            loop.call_soon_threadsafe(semaphore.release)
+        except RuntimeError:
+            pass  # Bucle ya cerrado: el consumidor abandonó la iteración
+
+    async def fetch(names):
+        await semaphore.acquire()
+        request = executor.submit(query_simbad, names[0], use_cache, cache)
+        request.add_done_callback(release)
+        try:
+            # shield: al agotar el plazo la petición sigue en su hilo y con su plaza
+            data = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(request)), deadline)
+            return names, data, None
+        except asyncio.TimeoutError:
+            return names, None, SimbadError(
+                f"Tiempo agotado consultando {names[0]} en SIMBAD ({deadline:.0f} s)")
+        except SimbadError as e:
+            return names, None, e
+        except Exception as e:
+            # Cualquier otro fallo (caché, datos inesperados) solo afecta a esta estrella
+            error = SimbadError(f"Error consultando {names[0]} en SIMBAD: {str(e)}")
+            error.__cause__ = e
+            return names, None, error
+
+    tasks = [asyncio.ensure_future(fetch(names)) for names in groups.values()]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            names, data, error = await next_result
+            for name in names:
+                yield name, None if data is None else dict(data, name=name), error
+    finally:
+        # El consumidor puede dejar de iterar antes de tiempo
+        for task in tasks:
+            task.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+async def collect_simbad_async(star_names, **options):
+    """Resultados de query_simbad_async como {nombre: datos o None}"""
+    return {name: data async for name, data, _ in query_simbad_async(star_names, **options)}
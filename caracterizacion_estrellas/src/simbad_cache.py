@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+# simbad_cache.py
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# Ubicación y parámetros por defecto de la caché
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / "cache" / "simbad_cache.sqlite"
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600  # 30 días
+DEFAULT_MAX_ENTRIES = 100000
+
+_FIELDS = ('radial_velocity_km_s', 'parallax_arcsec', 'mag_B', 'mag_V')
+# Identificadores por consulta 'IN (...)' (límite de parámetros de SQLite)
+_LOOKUP_CHUNK = 500
+
+def normalize_identifier(star_name):
+    """Normaliza un identificador: sin espacios repetidos y en mayúsculas"""
+    return ' '.join(star_name.split()).upper()
+
+class SimbadCache:
+    """
+    Caché persistente (SQLite) de consultas a SIMBAD con caducidad (TTL)
+    y expulsión LRU cuando se supera el número máximo de entradas
+    """
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL_SECONDS,
+                 max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if str(path) != ':memory:':
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        # La caché se comparte con los hilos de consulta de la GUI
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS simbad (
+                key TEXT PRIMARY KEY,
+                radial_velocity_km_s REAL,
+                parallax_arcsec REAL,
+                mag_B REAL,
+                mag_V REAL,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )""")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_last_access ON simbad (last_access)")
+        # Las cachés creadas antes del índice de alias no tienen la columna main_id
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(simbad)")]
+        if 'main_id' not in columns:
+            self._conn.execute("ALTER TABLE simbad ADD COLUMN main_id TEXT")
+        # Índice de alias: identificador normalizado -> clave del main_id en SIMBAD
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS aliases (
+                alias TEXT PRIMARY KEY,
+                key TEXT NOT NULL
+            )""")
+        # Para borrar los alias de un objeto expulsado sin recorrer toda la tabla
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_alias_key ON aliases (key)")
+        self._conn.commit()
+
+    def get(self, star_name):
+        """
+        Devuelve los datos guardados (formato de query_simbad) o None. Con
+        un alias conocido se devuelve la entrada de su main_id
+        """
+        now = time.time()
+        with self._lock:
+            key = self._resolve(star_name)
+            row = self._conn.execute(
+                "SELECT radial_velocity_km_s, parallax_arcsec, mag_B, mag_V, fetched_at, main_id "
+                "FROM simbad WHERE key = ?", (key,)).fetchone()
+
+            # Entrada inexistente o caducada
+            if row is None or (self.ttl is not None and now - row[4] > self.ttl):
+                if row is not None:
+                    self._conn.execute("DELETE FROM simbad WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE simbad SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        data = {'name': star_name, 'main_id': row[5]}
+        data.update(zip(_FIELDS, row[:4]))
+        return data
+
+    def put(self, star_name, data):
+        """
+        Guarda los datos de una estrella (bajo su main_id, si se conoce),
+        registra como alias el nombre consultado y los de data['ids'] y
+        aplica la política de expulsión
+        """
+        main_id = data.get('main_id')
+        key = normalize_identifier(main_id or star_name)
+        aliases = {normalize_identifier(name) for name in [star_name, *(data.get('ids') or [])]
+                   if name.strip()}
+        aliases.discard(key)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO simbad (key, radial_velocity_km_s, parallax_arcsec, "
+                "mag_B, mag_V, fetched_at, last_access, main_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, *(data.get(field) for field in _FIELDS), now, now, main_id))
+            self._conn.executemany("INSERT OR REPLACE INTO aliases VALUES (?, ?)",
+                                   [(alias, key) for alias in aliases])
+            self._evict()
+            self._conn.commit()
+
+    def resolve(self, star_name):
+        """Clave canónica de un identificador (la de su main_id si es un alias conocido)"""
+        with self._lock:
+            return self._resolve(star_name)
+
+    def canonical_ids(self, star_names):
+        """
+        Clave canónica de cada nombre, sin consultar SIMBAD. Solo los alias
+        conocidos se buscan en el índice, con una consulta por bloque de nombres
+        """
+        normalized = [normalize_identifier(name) for name in star_names]
+        unique = list(dict.fromkeys(normalized))
+        known = {}
+        with self._lock:
+            for start in range(0, len(unique), _LOOKUP_CHUNK):
+                chunk = unique[start:start + _LOOKUP_CHUNK]
+                known.update(self._conn.execute(
+                    f"SELECT alias, key FROM aliases WHERE alias IN ({','.join('?' * len(chunk))})",
+                    chunk).fetchall())
+        return [known.get(key, key) for key in normalized]
+
+    def _resolve(self, star_name):
+        key = normalize_identifier(star_name)
+        row = self._conn.execute("SELECT key FROM aliases WHERE alias = ?", (key,)).fetchone()
+        return row[0] if row is not None else key
+
+    def _evict(self):
+        """Elimina las entradas menos usadas recientemente por encima del límite"""
+        if self.max_entries is None:
+            return
+        count = self._conn.execute("SELECT COUNT(*) FROM simbad").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            evicted = self._conn.execute(
+                "SELECT key FROM simbad ORDER BY last_access LIMIT ?", (excess,)).fetchall()
+            self._conn.executemany("DELETE FROM simbad WHERE key = ?", evicted)
+            # Alias de los objetos expulsados (por el índice idx_alias_key)
+            self._conn.executemany("DELETE FROM aliases WHERE key = ?", evicted)
+
+    def stats(self):
+        """Contadores de aciertos/fallos y tamaño actual de la caché"""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM simbad").fetchone()[0]
+            aliases = self._conn.execute("SELECT COUNT(*) FROM aliases").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': size,
+            'aliases': aliases,
+            'max_entries': self.max_entries
+        }
+
+    def clear(self):
+        """Vacía la caché y reinicia los contadores"""
+        with self._lock:
+            self._conn.execute("DELETE FROM simbad")
+            self._conn.execute("DELETE FROM aliases")
+            self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_default_cache = None
+
+def get_default_cache():
+    """Caché compartida por defecto (se crea en el primer uso)"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SimbadCache()
+    return _default_cache
+
+def get_existing_cache():
+    """Caché por defecto solo si ya existe (None si nunca se consultó SIMBAD)"""
+    if _default_cache is None and not DEFAULT_CACHE_PATH.exists():
+        return None
+    return get_default_cache()
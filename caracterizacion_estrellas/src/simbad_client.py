@@ -1,9 +1,26 @@
 from astroquery.simbad import Simbad
 import numpy as np
+import threading
 import warnings
 from astropy.utils.exceptions import AstropyWarning
+from src.simbad_cache import get_default_cache, normalize_identifier
+from src.tracing import span
+from src.simbad_retry import (CircuitBreaker, SimbadError, SimbadUnavailableError,
+                              call_with_retries)
+from src.simbad_scheduler import RequestScheduler
 
-def configure_simbad():
+# Número máximo de identificadores por consulta múltiple
+BATCH_CHUNK_SIZE = 500
+# Prefijos de los identificadores de SIMBAD que no se suelen escribir
+SIMBAD_ID_PREFIXES = ('NAME ', 'V* ', '* ')
+# Tiempo máximo de espera de cada petición (s)
+DEFAULT_TIMEOUT = 60
+# Reintentos ante errores transitorios y espera exponencial entre ellos (s)
+DEFAULT_RETRIES = 3
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_MAX_DELAY = 8.0
+
+def configure_simbad(row_limit=1, timeout=DEFAULT_TIMEOUT):
     """Configuración para obtener todos los datos necesarios"""
     custom_simbad = Simbad()
     
@@ -14,61 +31,284 @@ def configure_simbad():
         'rvz_radvel',  # Velocidad radial en km/s
         'plx_value',   # Paralaje en miliarcosegundos
         'B',           # Magnitud B
-        'V'            # Magnitud V
+        'V',           # Magnitud V
+        'ids'          # Todos los identificadores del objeto (para el índice de alias)
     )
     
     # Ajustes adicionales para controlar la consulta
-    custom_simbad.TIMEOUT = 60
-    custom_simbad.ROW_LIMIT = 1
+    custom_simbad.TIMEOUT = timeout
+    custom_simbad.ROW_LIMIT = row_limit  # -1 para consultas sin límite
     return custom_simbad
 
-def query_simbad(star_name):
-    """Consulta para SIMBAD tipo query_object"""
+class AstroqueryTransport:
+    """
+    Transporte por defecto: consultas reales a SIMBAD con astroquery.
+    Cualquier objeto con query_object(nombre) y query_objects(nombres) que
+    devuelva tablas de astropy puede sustituirlo (ver src/simbad_transport.py).
+    Las instancias de Simbad se crean una vez y se reutilizan, junto con su
+    sesión HTTP (y sus conexiones abiertas)
+    """
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._simbad = {}
+    
+    def _get_simbad(self, row_limit):
+        with self._lock:
+            if row_limit not in self._simbad:
+                self._simbad[row_limit] = configure_simbad(row_limit, self.timeout)
+            return self._simbad[row_limit]
+    
+    def query_object(self, star_name):
+        return self._get_simbad(1).query_object(star_name)
+    
+    def query_objects(self, star_names):
+        return self._get_simbad(-1).query_objects(star_names)
+
+class SimbadClient:
+    """
+    Cliente de larga duración para todas las consultas: usa el transporte
+    activo, pasa cada petición (también los reintentos) por el planificador
+    compartido que limita el ritmo y la concurrencia, reintenta los errores
+    transitorios con espera exponencial y comparte un disyuntor que falla de
+    inmediato mientras SIMBAD no responde
+    """
+    def __init__(self, retries=DEFAULT_RETRIES, base_delay=DEFAULT_BASE_DELAY,
+                 max_delay=DEFAULT_MAX_DELAY, breaker=None, scheduler=None):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.scheduler = scheduler if scheduler is not None else RequestScheduler()
+    
+    def query_object(self, star_name):
+        return self._call(lambda: get_transport().query_object(star_name))
+    
+    def query_objects(self, star_names):
+        return self._call(lambda: get_transport().query_objects(star_names))
+    
+    def _call(self, request):
+        return call_with_retries(lambda: self.scheduler.run(request), self.retries,
+                                 self.base_delay, self.max_delay, breaker=self.breaker)
+
+_transport = None
+
+def get_transport():
+    """Transporte activo (se crea el de astroquery en el primer uso)"""
+    global _transport
+    if _transport is None:
+        _transport = AstroqueryTransport()
+    return _transport
+
+def set_transport(transport):
+    """Sustituye el transporte de todas las consultas (None: el de astroquery)"""
+    global _transport
+    _transport = transport
+
+_client = None
+
+def get_client():
+    """Cliente compartido (se crea con la configuración por defecto en el primer uso)"""
+    global _client
+    if _client is None:
+        _client = SimbadClient()
+    return _client
+
+def configure_client(timeout=None, **options):
+    """
+    Sustituye el cliente compartido
+    Args:
+        timeout: Tiempo máximo por petición (s) del transporte de astroquery
+        options: retries, base_delay, max_delay, breaker y scheduler de SimbadClient
+    """
+    global _client
+    if timeout is not None:
+        set_transport(AstroqueryTransport(timeout=timeout))
+    _client = SimbadClient(**options)
+    return _client
+
+def query_simbad(star_name, use_cache=True, cache=None):
+    """
+    Consulta para SIMBAD tipo query_object (con caché local en disco)
+    Returns:
+        dict: Datos de la estrella, o None si SIMBAD no la conoce
+    Raises:
+        SimbadError: Fallo de la consulta (SimbadUnavailableError si el
+            servicio no responde), para no confundirlo con 'no encontrada'
+    """
     warnings.simplefilter('ignore', AstropyWarning)
     
-    # Control de errores: hay algo ahí?
-    try:
-        simbad = configure_simbad()
-        result = simbad.query_object(star_name)
-        
-        if result is None or len(result) == 0:
-            print(f"No se encontraron resultados para {star_name}")
-            return None
-        
-        # Extracción de datos
-        data = {
-            'name': star_name,
-            'radial_velocity_km_s': _safe_extract(result, 'rvz_radvel'),
-            'parallax_arcsec': _safe_extract_parallax(result),
-            'mag_B': _safe_extract(result, 'B'),
-            'mag_V': _safe_extract(result, 'V')
-        }
+    cache = _get_cache(use_cache, cache)
+    if cache is not None:
+        data = cache.get(star_name)
+        if data is not None:
+            return data
+    
+    with span('simbad.consulta', stars=1):
+        result = get_client().query_object(star_name)
+    
+    if result is None or len(result) == 0:
+        print(f"No se encontraron resultados para {star_name}")
+        return None
+    
+    # Extracción de datos
+    data = _extract_data(result, star_name)
+    
+    # Depuración: Mostrar los datos crudos obtenidos
+    print("\nDatos crudos de SIMBAD:")
+    print(data['name'])
+    print(data['radial_velocity_km_s'])
+    print(data['parallax_arcsec'])
+    print(data['mag_B'])
+    print(data['mag_V'])
+    
+    if cache is not None:
+        cache.put(star_name, data)
+    return data
+
+def query_simbad_batch(star_names, chunk_size=BATCH_CHUNK_SIZE, use_cache=True, cache=None):
+    """
+    Consulta múltiple a SIMBAD (query_objects) para una lista de estrellas
+    Args:
+        star_names: Lista de nombres de estrellas
+        chunk_size: Número máximo de nombres por petición
+        use_cache, cache: Igual que en query_simbad
+    Returns:
+        dict: {nombre: datos o None}, con el mismo formato que query_simbad.
+            Los fallos de SIMBAD no interrumpen el proceso: esas estrellas
+            quedan en None y se avisa de ellas aparte de las no encontradas
+    """
+    warnings.simplefilter('ignore', AstropyWarning)
+    
+    # Nombres únicos, conservando el orden de entrada
+    unique_names = list(dict.fromkeys(name.strip() for name in star_names if name.strip()))
+    results = {name: None for name in unique_names}
+    
+    # Nombres del mismo objeto (alias conocidos o misma forma normalizada):
+    # una sola consulta por grupo, con el primer nombre como representante
+    cache = _get_cache(use_cache, cache)
+    keys = (cache.canonical_ids(unique_names) if cache is not None
+            else [normalize_identifier(name) for name in unique_names])
+    groups = {}
+    for name, key in zip(unique_names, keys):
+        groups.setdefault(key, []).append(name)
+    
+    def resolve_group(key, data):
+        for name in groups[key]:
+            results[name] = dict(data, name=name)
+    
+    def cached(key):
+        """Resuelve el grupo con la caché (incluidos alias aprendidos en lotes anteriores)"""
+        data = cache.get(groups[key][0]) if cache is not None else None
+        if data is not None:
+            resolve_group(key, data)
+        return data is not None
+    
+    # Solo se consultan en SIMBAD los objetos que no están en caché
+    pending = [key for key in groups if not cached(key)]
+    if not pending:
+        return results
+    
+    client = get_client()
+    # Estrellas que no se pudieron consultar (distintas de las no encontradas)
+    failed = []
+    for start in range(0, len(pending), chunk_size):
+        chunk_keys = pending[start:start + chunk_size]
+        if start:
+            chunk_keys = [key for key in chunk_keys if not cached(key)]
+        if not chunk_keys:
+            continue
+        representatives = {groups[key][0]: key for key in chunk_keys}
+        chunk = list(representatives)
+        try:
+            with span('simbad.consulta_lote', stars=len(chunk)):
+                table = client.query_objects(chunk)
+        except SimbadUnavailableError as e:
+            # Servicio caído: el resto de lotes fallaría igual, se abandona
+            failed.extend(name for key in pending[start:] for name in groups[key]
+                          if results[name] is None)
+            print(f"{str(e)}. Se continúa sin los datos de {len(failed)} estrellas")
+            break
+        except SimbadError as e:
+            failed.extend(name for key in chunk_keys for name in groups[key])
+            print(f"Error consultando SIMBAD (lote de {len(chunk)}): {str(e)}")
+            continue
         
-        # Depuración: Mostrar los datos crudos obtenidos
-        print("\nDatos crudos de SIMBAD:")
-        print(data['name'])
-        print(data['radial_velocity_km_s'])
-        print(data['parallax_arcsec'])
-        print(data['mag_B'])
-        print(data['mag_V'])
-        return data
+        if table is None or len(table) == 0:
+            continue
         
-    except Exception as e:
-        print(f"Error consultando SIMBAD: {str(e)}")
+        for i, star_name in enumerate(table['user_specified_id']):
+            star_name = str(star_name)
+            key = representatives.get(star_name)
+            # Filas vacías: objeto no encontrado
+            if key is None or results[star_name] is not None or _is_missing(table, 'main_id', i):
+                continue
+            data = _extract_data(table, star_name, i)
+            resolve_group(key, data)
+            if cache is not None:
+                cache.put(star_name, data)
+    
+    failed_names = set(failed)
+    not_found = [name for name, data in results.items() if data is None and name not in failed_names]
+    if not_found:
+        print(f"No se encontraron resultados para: {', '.join(not_found)}")
+    return results
+
+def _get_cache(use_cache, cache):
+    """Caché a utilizar: la indicada, la compartida por defecto o ninguna"""
+    if not use_cache:
         return None
+    return cache if cache is not None else get_default_cache()
+
+def _extract_data(result, star_name, row=0):
+    """Diccionario con los datos de la estrella en la fila indicada"""
+    return {
+        'name': star_name,
+        'main_id': None if _is_missing(result, 'main_id', row) else str(result['main_id'][row]).strip(),
+        'ids': _extract_ids(result, row),
+        'radial_velocity_km_s': _safe_extract(result, 'rvz_radvel', row),
+        'parallax_arcsec': _safe_extract_parallax(result, row),
+        'mag_B': _safe_extract(result, 'B', row),
+        'mag_V': _safe_extract(result, 'V', row)
+    }
+
+def _extract_ids(result, row=0):
+    """
+    Identificadores del objeto (campo 'ids', separados por '|'). Se añaden
+    también sin los prefijos de SIMBAD ('NAME Groombridge 1830' -> 'Groombridge 1830')
+    """
+    if _is_missing(result, 'ids', row):
+        return []
+    ids = []
+    for identifier in str(result['ids'][row]).split('|'):
+        identifier = identifier.strip()
+        if not identifier:
+            continue
+        ids.append(identifier)
+        for prefix in SIMBAD_ID_PREFIXES:
+            if identifier.startswith(prefix):
+                ids.append(identifier[len(prefix):].strip())
+    return ids
+
+def _is_missing(result, field, row=0):
+    """Comprueba si un campo está ausente o enmascarado"""
+    if field not in result.colnames:
+        return True
+    value = result[field][row]
+    return value is np.ma.masked or str(value).strip() == ''
 
-def _safe_extract(result, field):
+def _safe_extract(result, field, row=0):
     """Extrae un campo si contiene información"""
     if field not in result.colnames:
         return None
-    value = result[field][0]
+    value = result[field][row]
     return float(value) if value is not np.ma.masked else None
 
-def _safe_extract_parallax(result):
+def _safe_extract_parallax(result, row=0):
     """Extrae y convierte la paralaje a arcsec"""
     if 'plx_value' not in result.colnames:
         return None
-    value = result['plx_value'][0]
+    value = result['plx_value'][row]
     if value is np.ma.masked:
         return None
     return float(value) / 1000  # Convertir a arcsec# -*- coding: utf-8 -*-
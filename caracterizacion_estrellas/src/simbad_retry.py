@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+# simbad_retry.py
+# Reintentos con espera exponencial (y variación aleatoria) ante errores
+# transitorios de red, y disyuntor (circuit breaker) que deja de llamar a
+# SIMBAD mientras el servicio no responde
+import random
+import threading
+import time
+
+class SimbadError(Exception):
+    """Error al consultar SIMBAD (distinto de 'objeto no encontrado')"""
+
+class SimbadUnavailableError(SimbadError):
+    """SIMBAD no está disponible: disyuntor abierto o reintentos agotados"""
+
+# Nombres de excepciones de red de requests/pyvo/urllib3 (sin importarlos aquí)
+_TRANSIENT_NAMES = {'Timeout', 'ReadTimeout', 'ConnectTimeout', 'ConnectionError',
+                    'DALServiceError', 'ChunkedEncodingError', 'ProtocolError',
+                    'RemoteDisconnected', 'IncompleteRead'}
+# Códigos HTTP que indican un problema pasajero del servidor
+_TRANSIENT_STATUS = {429, 500, 502, 503, 504}
+
+def is_transient(error):
+    """Indica si merece la pena reintentar la petición que produjo error"""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is None:
+        # Código HTTP de pyvo (DALServiceError.code) o de urllib (HTTPError.code)
+        code = getattr(error, 'code', None)
+        status = code if isinstance(code, int) else None
+    if status is not None:
+        return status in _TRANSIENT_STATUS
+    return any(cls.__name__ in _TRANSIENT_NAMES for cls in type(error).__mro__)
+
+class CircuitBreaker:
+    """
+    Disyuntor: tras failure_threshold fallos seguidos se abre y rechaza las
+    llamadas durante reset_timeout segundos; después deja pasar una de prueba
+    (semiabierto) y se cierra si tiene éxito
+    """
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return 'closed'
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def before_call(self):
+        """Lanza SimbadUnavailableError si el disyuntor no deja pasar la llamada"""
+        with self._lock:
+            state = self._state()
+            if state == 'open' or (state == 'half-open' and self._probing):
+                remaining = self.reset_timeout - (self._clock() - self._opened_at)
+                raise SimbadUnavailableError(
+                    f"SIMBAD no responde; se reintentará en {max(remaining, 0):.0f} s")
+            if state == 'half-open':
+                # Solo una llamada de prueba a la vez
+                self._probing = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                # Fallo de la llamada de prueba o demasiados fallos seguidos
+                self._opened_at = self._clock()
+
+    def reset(self):
+        self.record_success()
+
+def backoff_delays(retries, base_delay=0.5, max_delay=8.0, rng=random):
+    """
+    Esperas antes de cada reintento: exponencial con variación completa
+    (uniforme entre 0 y base_delay * 2**intento, limitada a max_delay)
+    """
+    return [rng.uniform(0, min(max_delay, base_delay * 2 ** attempt)) for attempt in range(retries)]
+
+def call_with_retries(func, retries=3, base_delay=0.5, max_delay=8.0, breaker=None,
+                      sleep=time.sleep):
+    """
+    Llama a func() reintentando los errores transitorios
+    Args:
+        func: Función sin argumentos que hace la petición
+        retries: Reintentos tras el primer intento
+        base_delay, max_delay: Parámetros de la espera exponencial (s)
+        breaker: CircuitBreaker compartido (opcional)
+    Raises:
+        SimbadUnavailableError: Disyuntor abierto o errores transitorios en todos los intentos
+        SimbadError: Error no transitorio (se conserva el original como causa)
+    """
+    delays = backoff_delays(retries, base_delay, max_delay)
+    for attempt in range(retries + 1):
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            result = func()
+        except Exception as e:
+            if not is_transient(e):
+                # Fallo de la propia petición: no cuenta para el disyuntor
+                if breaker is not None:
+                    breaker.record_success()
+                raise SimbadError(f"Error consultando SIMBAD: {str(e)}") from e
+            if breaker is not None:
+                breaker.record_failure()
+            if attempt == retries:
+                raise SimbadUnavailableError(
+                    f"SIMBAD no disponible tras {retries + 1} intentos: {str(e)}") from e
+            sleep(delays[attempt])
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+# simbad_scheduler.py
+# Planificador de peticiones a SIMBAD: cubo de fichas (token bucket) que
+# limita las consultas por segundo, límite de peticiones simultáneas y cola
+# justa entre llamantes (hilo de la GUI, modo por lotes, hilos de trabajo):
+# los turnos se reparten por rondas, de modo que un lote grande no deja
+# esperando a una consulta suelta
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+# SIMBAD pide no superar unas pocas consultas por segundo por cliente
+DEFAULT_RATE = 5.0          # Fichas (peticiones) por segundo
+DEFAULT_BURST = 5           # Fichas acumulables (ráfaga máxima)
+DEFAULT_MAX_CONCURRENT = 2  # Peticiones en curso a la vez
+
+class RequestScheduler:
+    """
+    Concede turnos de petición respetando rate (peticiones/s con ráfagas de
+    hasta burst) y max_concurrent, sirviendo por rondas a los llamantes
+    Args:
+        rate: Peticiones por segundo (None: sin límite de ritmo)
+        burst: Capacidad del cubo de fichas
+        max_concurrent: Peticiones simultáneas (None: sin límite)
+    """
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST,
+                 max_concurrent=DEFAULT_MAX_CONCURRENT, clock=time.monotonic):
+        if rate is not None and rate <= 0:
+            raise ValueError(f"El ritmo debe ser positivo (None: sin límite), no {rate}")
+        if burst < 1:
+            raise ValueError(f"La ráfaga debe admitir al menos una petición, no {burst}")
+        if max_concurrent is not None and max_concurrent < 1:
+            raise ValueError(f"Debe admitirse al menos una petición simultánea, no {max_concurrent}")
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._active = 0
+        # Llamante -> cola de turnos pendientes, en orden de ronda
+        self._queues = OrderedDict()
+        self.requests = 0
+        self.wait_time = 0.0
+
+    @contextmanager
+    def slot(self, caller=None):
+        """
+        Espera turno, ejecuta el bloque y libera la plaza:
+            with scheduler.slot():
+                transport.query_object(nombre)
+        caller identifica al llamante (por defecto, el hilo actual)
+        """
+        self.acquire(caller)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def acquire(self, caller=None):
+        """Bloquea hasta que es el turno del llamante y hay ficha y plaza libres"""
+        caller = caller if caller is not None else threading.current_thread().name
+        turn = object()
+        start = self._clock()
+        with self._cond:
+            self._queues.setdefault(caller, deque()).append(turn)
+            while True:
+                if self._next_turn() is turn and self._has_slot():
+                    delay = self._take_token()
+                    if delay == 0:
+                        self._grant(caller)
+                        break
+                    self._cond.wait(delay)
+                else:
+                    self._cond.wait()
+            self.requests += 1
+            self.wait_time += self._clock() - start
+
+    def release(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def run(self, request, caller=None):
+        """Ejecuta request() cuando el planificador lo permite"""
+        with self.slot(caller):
+            return request()
+
+    def stats(self):
+        with self._cond:
+            return {
+                'requests': self.requests,
+                'mean_wait_s': self.wait_time / self.requests if self.requests else 0.0,
+                'active': self._active,
+                'queued': sum(len(queue) for queue in self._queues.values())
+            }
+
+    def _next_turn(self):
+        """Primer turno del llamante al que le toca en la ronda"""
+        if not self._queues:
+            return None
+        return self._queues[next(iter(self._queues))][0]
+
+    def _has_slot(self):
+        return self.max_concurrent is None or self._active < self.max_concurrent
+
+    def _take_token(self):
+        """Toma una ficha si hay; si no, devuelve cuánto falta para la siguiente (s)"""
+        if self.rate is None:
+            return 0
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0
+        return (1 - self._tokens) / self.rate
+
+    def _grant(self, caller):
+        """Concede el turno y pasa el llamante al final de la ronda"""
+        queue = self._queues[caller]
+        queue.popleft()
+        if queue:
+            self._queues.move_to_end(caller)
+        else:
+            del self._queues[caller]
+        self._active += 1
+        self._cond.notify_all()
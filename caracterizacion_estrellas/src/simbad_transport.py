@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+# simbad_transport.py
+# Transportes alternativos para src/simbad_client: grabación de respuestas
+# reales en ficheros y reproducción local con latencia, variación y errores
+# simulados. Uso:
+#   set_transport(RecordingTransport(AstroqueryTransport(), 'fixtures'))
+#   set_transport(ReplayTransport('fixtures', latency=0.3, jitter=0.1, error_rate=0.05))
+import hashlib
+import random
+import threading
+import time
+from pathlib import Path
+import numpy as np
+from astropy.table import Table, vstack
+from src.simbad_cache import normalize_identifier
+
+def fixture_path(fixture_dir, star_name):
+    """Fichero ECSV de la respuesta grabada para un identificador"""
+    key = normalize_identifier(star_name)
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    safe = ''.join(c if c.isalnum() else '_' for c in key)[:40]
+    return Path(fixture_dir) / f"{safe}_{digest}.ecsv"
+
+def _has_main_id(table, row):
+    """Indica si la fila corresponde a un objeto encontrado"""
+    value = table['main_id'][row] if 'main_id' in table.colnames else ''
+    return value is not np.ma.masked and str(value).strip() != ''
+
+class RecordingTransport:
+    """Envuelve otro transporte y guarda cada respuesta como fichero ECSV"""
+    def __init__(self, inner, fixture_dir):
+        self.inner = inner
+        self.fixture_dir = Path(fixture_dir)
+        self.fixture_dir.mkdir(parents=True, exist_ok=True)
+
+    def query_object(self, star_name):
+        result = self.inner.query_object(star_name)
+        self._save(star_name, result)
+        return result
+
+    def query_objects(self, star_names):
+        result = self.inner.query_objects(star_names)
+        # Una grabación por identificador, para poder reproducirlos sueltos
+        for star_name in star_names:
+            rows = None
+            if result is not None and len(result):
+                # Filas del identificador con main_id (sin él: no encontrado)
+                mask = [str(value) == star_name and _has_main_id(result, i)
+                        for i, value in enumerate(result['user_specified_id'])]
+                rows = result[mask]
+            self._save(star_name, rows)
+        return result
+
+    def _save(self, star_name, table):
+        """Guarda la respuesta (una tabla vacía indica 'no encontrado')"""
+        if table is None:
+            table = Table()
+        table = Table(table, masked=True, copy=True)
+        if 'user_specified_id' in table.colnames:
+            table.remove_column('user_specified_id')
+        table.meta['query'] = star_name
+        table.write(fixture_path(self.fixture_dir, star_name), format='ascii.ecsv', overwrite=True)
+
+class ReplayTransport:
+    """
+    Reproduce respuestas grabadas sin red, simulando la latencia del servicio
+    Args:
+        fixture_dir: Directorio con las grabaciones de RecordingTransport
+        latency: Latencia base por petición (s)
+        jitter: Variación aleatoria uniforme añadida a la latencia (s)
+        error_rate: Probabilidad de que una petición falle con ConnectionError
+        seed: Semilla para reproducir la misma secuencia de retardos y errores
+    """
+    def __init__(self, fixture_dir, latency=0.0, jitter=0.0, error_rate=0.0, seed=None):
+        self.fixture_dir = Path(fixture_dir)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def query_object(self, star_name):
+        self._simulate_network()
+        table = self._load(star_name)
+        return table if table is not None and len(table) else None
+
+    def query_objects(self, star_names):
+        # Una sola petición para todo el lote, como query_objects real
+        self._simulate_network()
+        tables = []
+        for star_name in star_names:
+            table = self._load(star_name)
+            if table is not None and len(table):
+                table = Table(table, masked=True, copy=True)
+                table['user_specified_id'] = [star_name] * len(table)
+                tables.append(table)
+        return vstack(tables) if tables else Table()
+
+    def _simulate_network(self):
+        """Espera la latencia simulada y, según error_rate, falla"""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        time.sleep(delay)
+        if failed:
+            raise ConnectionError("Error de red simulado (ReplayTransport)")
+
+    def _load(self, star_name):
+        """Respuesta grabada del identificador (None si no hay grabación)"""
+        path = fixture_path(self.fixture_dir, star_name)
+        if not path.exists():
+            return None
+        return Table.read(path, format='ascii.ecsv')
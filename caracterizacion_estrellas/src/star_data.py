@@ -20,6 +20,92 @@ STANDARD_STARS = [
     ('M8', 1.80, 16)
 ]
 
+# Tabla densa de la secuencia principal (B-V -> Mv y B-V -> subtipo espectral)
+# interpolada a partir de STANDARD_STARS para clasificar en bloque
+MAIN_SEQUENCE_SAMPLES = 4096
+SPECTRAL_CLASSES = 'OBAFGKM'
+SPECTRAL_LABELS = np.array([f'{letter}{digit}' for letter in SPECTRAL_CLASSES
+                            for digit in range(10)] + [''], dtype='U2')
+
+def spectral_code(spectral_type):
+    """Código numérico de un tipo espectral: 'G5' -> 45 (clase * 10 + subtipo)"""
+    return SPECTRAL_CLASSES.index(spectral_type[0]) * 10 + float(spectral_type[1:])
+
+def build_main_sequence_table(standard_stars=STANDARD_STARS, samples=MAIN_SEQUENCE_SAMPLES):
+    """
+    Muestrea densamente la secuencia principal
+    Returns:
+        dict: 'bv' (rejilla de B-V), 'mv' (Mv) y 'code' (código espectral)
+    """
+    ordered = sorted(standard_stars, key=lambda star: star[1])
+    bv_std = np.array([star[1] for star in ordered])
+    mv_std = np.array([star[2] for star in ordered])
+    code_std = np.array([spectral_code(star[0]) for star in ordered])
+    
+    bv = np.linspace(bv_std[0], bv_std[-1], samples)
+    return {
+        'bv': bv,
+        'mv': np.interp(bv, bv_std, mv_std),
+        'code': np.interp(bv, bv_std, code_std)
+    }
+
+MAIN_SEQUENCE_TABLE = build_main_sequence_table()
+
+def _main_sequence_index(b_v, table=MAIN_SEQUENCE_TABLE):
+    """Índice del punto más cercano de la tabla y máscara de B-V dentro de rango"""
+    b_v = np.asarray(b_v, dtype=np.float64)
+    grid = table['bv']
+    inside = (b_v >= grid[0]) & (b_v <= grid[-1])
+    # Rejilla uniforme: el índice se calcula directamente, sin búsqueda
+    step = (grid[-1] - grid[0]) / (len(grid) - 1)
+    with np.errstate(invalid='ignore'):
+        index = np.rint((b_v - grid[0]) / step)
+    index = np.clip(np.nan_to_num(index), 0, len(grid) - 1).astype(np.intp)
+    return index, inside
+
+def _lookup_mv(index, inside, table):
+    return np.where(inside, table['mv'][index], np.nan)
+
+def _lookup_subtype(index, inside, table):
+    code = np.clip(np.rint(table['code'][index]).astype(np.intp), 0, len(SPECTRAL_LABELS) - 2)
+    # La última etiqueta ('') marca los valores fuera de la tabla
+    code[~inside] = len(SPECTRAL_LABELS) - 1
+    return SPECTRAL_LABELS[code]
+
+def main_sequence_mv(b_v, table=MAIN_SEQUENCE_TABLE):
+    """Mv de la secuencia principal para cada B-V (NaN fuera de la tabla)"""
+    return _lookup_mv(*_main_sequence_index(b_v, table), table)
+
+def spectral_subtype(b_v, table=MAIN_SEQUENCE_TABLE):
+    """Subtipo espectral (p. ej. 'G2') para cada B-V ('' fuera de la tabla)"""
+    return _lookup_subtype(*_main_sequence_index(b_v, table), table)
+
+# Columnas que devuelve classify_batch
+CLASSIFICATION_COLUMNS = ['Tipo_espectral', 'Mv_SP', 'Delta_Mv', 'Distancia_esp']
+
+def classify_batch(b_v, Mv, V, table=MAIN_SEQUENCE_TABLE):
+    """
+    Clasificación vectorizada respecto a la secuencia principal
+    Args:
+        b_v: Índice de color B-V (array)
+        Mv: Magnitud absoluta obtenida con la paralaje (array)
+        V: Magnitud aparente V (array)
+    Returns:
+        dict: 'Tipo_espectral', 'Mv_SP' (Mv de la secuencia principal),
+            'Delta_Mv' (Mv - Mv_SP, positivo por debajo de la secuencia) y
+            'Distancia_esp' (distancia espectroscópica en pc)
+    """
+    index, inside = _main_sequence_index(b_v, table)
+    mv_ms = _lookup_mv(index, inside, table)
+    V = np.asarray(V, dtype=np.float64)
+    return {
+        'Tipo_espectral': _lookup_subtype(index, inside, table),
+        'Mv_SP': mv_ms,
+        'Delta_Mv': np.asarray(Mv, dtype=np.float64) - mv_ms,
+        # Módulo de distancia: V - Mv = 5 log10(d) - 5
+        'Distancia_esp': 10 ** ((V - mv_ms + 5) / 5)
+    }
+
 def calculate_proper_motion(angular_displacement, delta_time_years):
     """Calcula el movimiento propio en arcsec/año"""
     return angular_displacement / delta_time_years
@@ -48,3 +134,127 @@ def calculate_tangential_velocity(proper_motion_arcsec_year, distance_pc):
 def calculate_total_velocity(Vr, Vt):
     """Calcula la velocidad total en km/s"""
     return np.sqrt(Vr**2 + Vt**2)
+
+
+# Columnas de resultados, en el mismo orden que la tabla de resultados
+RESULT_COLUMNS = ['Mov_propio', 'Distancia', 'B-V', 'Mv', 'Vt', 'V_total']
+# Resultados en forma de array estructurado (una fila por estrella)
+RESULT_DTYPE = np.dtype([('Nombre', 'O')] + [(col, 'f8') for col in RESULT_COLUMNS])
+
+def calculate_batch(angular_displacement, delta_time_years, parallax_arcsec, B, V, Vr):
+    """
+    Calcula todas las magnitudes derivadas para N estrellas de una sola vez
+    Args:
+        angular_displacement: Desplazamiento angular en arcsec (array)
+        delta_time_years: Tiempo entre observaciones en años (array)
+        parallax_arcsec: Paralaje en arcsec (array)
+        B, V: Magnitudes B y V (arrays)
+        Vr: Velocidad radial en km/s (array)
+    Returns:
+        dict: Columnas de RESULT_COLUMNS como arrays de NumPy
+    """
+    angular_displacement = np.asarray(angular_displacement, dtype=np.float64)
+    delta_time_years = np.asarray(delta_time_years, dtype=np.float64)
+    parallax_arcsec = np.asarray(parallax_arcsec, dtype=np.float64)
+    B = np.asarray(B, dtype=np.float64)
+    V = np.asarray(V, dtype=np.float64)
+    Vr = np.asarray(Vr, dtype=np.float64)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Paralajes nulas o negativas -> distancia infinita (por máscara, sin bucle)
+        distancia = np.where(parallax_arcsec > 0, 1 / parallax_arcsec, np.inf)
+        mov_propio = calculate_proper_motion(angular_displacement, delta_time_years)
+        b_v = calculate_spectral_index(B, V)
+        mv = calculate_absolute_magnitude(V, distancia)
+        vt = calculate_tangential_velocity(mov_propio, distancia)
+        v_total = calculate_total_velocity(Vr, vt)
+    
+    return {
+        'Mov_propio': mov_propio,
+        'Distancia': distancia,
+        'B-V': b_v,
+        'Mv': mv,
+        'Vt': vt,
+        'V_total': v_total
+    }
+
+def calculate_batch_dataframe(df):
+    """
+    Versión de calculate_batch para un DataFrame con las columnas de add_star
+    ('angular_displacement', 'parallax', 'vr', 'B', 'V' y 'delta_time' o
+    bien 'date1' y 'date2'). Devuelve un DataFrame con 'Nombre' y RESULT_COLUMNS
+    """
+    import pandas as pd
+    
+    if 'delta_time' in df.columns:
+        delta_time = df['delta_time'].to_numpy(dtype=np.float64)
+    else:
+        delta_days = (pd.to_datetime(df['date2']) - pd.to_datetime(df['date1'])).dt.days
+        delta_time = delta_days.to_numpy(dtype=np.float64) / 365.25
+    
+    columns = calculate_batch(
+        df['angular_displacement'].to_numpy(),
+        delta_time,
+        df['parallax'].to_numpy(),
+        df['B'].to_numpy(),
+        df['V'].to_numpy(),
+        df['vr'].to_numpy()
+    )
+    result = pd.DataFrame(columns, index=df.index)
+    if 'name' in df.columns:
+        result.insert(0, 'Nombre', df['name'])
+    return result
+
+def as_array(data):
+    """Array estructurado de un StarStore (el resto de datos no se modifica)"""
+    return getattr(data, 'records', data)
+
+def is_structured(data):
+    """Comprueba si los datos son un array estructurado (o un StarStore)"""
+    data = as_array(data)
+    return getattr(data, 'dtype', None) is not None and data.dtype.names is not None
+
+def stars_to_columns(stars_data):
+    """Columnas de NumPy de las estrellas (lista de diccionarios, StarStore o array estructurado)"""
+    if is_structured(stars_data):
+        # Las columnas ya existen: vistas sin copia
+        data = as_array(stars_data)
+        return {field: data[field] for field in
+                ('angular_displacement', 'delta_time', 'parallax', 'B', 'V', 'vr')}
+    
+    delta_time = [(star['date2'] - star['date1']).days / 365.25 for star in stars_data]
+    return {
+        'angular_displacement': np.array([star['angular_displacement'] for star in stars_data], dtype=np.float64),
+        'delta_time': np.array(delta_time, dtype=np.float64),
+        'parallax': np.array([star['parallax'] for star in stars_data], dtype=np.float64),
+        'B': np.array([star['B'] for star in stars_data], dtype=np.float64),
+        'V': np.array([star['V'] for star in stars_data], dtype=np.float64),
+        'vr': np.array([star['vr'] for star in stars_data], dtype=np.float64)
+    }
+
+def calculate_stars(stars_data):
+    """
+    Calcula los resultados de una lista de estrellas (formato de add_star).
+    Con un StarStore o array estructurado devuelve un array RESULT_DTYPE
+    """
+    structured = is_structured(stars_data)
+    if not len(stars_data):
+        return np.zeros(0, dtype=RESULT_DTYPE) if structured else []
+    cols = stars_to_columns(stars_data)
+    batch = calculate_batch(cols['angular_displacement'], cols['delta_time'],
+                            cols['parallax'], cols['B'], cols['V'], cols['vr'])
+    
+    if structured:
+        data = as_array(stars_data)
+        results = np.empty(len(data), dtype=RESULT_DTYPE)
+        results['Nombre'] = data['name']
+        for key in RESULT_COLUMNS:
+            results[key] = batch[key]
+        return results
+    
+    # Lista de diccionarios para la ventana de resultados
+    return [
+        {'Nombre': star['name'],
+         **{key: float(batch[key][i]) for key in RESULT_COLUMNS}}
+        for i, star in enumerate(stars_data)
+    ]
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+# star_store.py
+import numpy as np
+
+# Columnas tipadas de los datos de entrada (mismos campos que add_star)
+STAR_DTYPE = np.dtype([
+    ('name', 'O'),
+    ('angular_displacement', 'f8'),
+    ('date1', 'M8[D]'),
+    ('date2', 'M8[D]'),
+    ('delta_time', 'f8'),
+    ('parallax', 'f8'),
+    ('vr', 'f8'),
+    ('B', 'f8'),
+    ('V', 'f8')
+])
+
+class StarStore:
+    """
+    Almacén columnar de estrellas sobre un array estructurado de NumPy.
+    Cada fila admite el mismo acceso por campo que los diccionarios de
+    add_star (star['parallax']), pero las fechas son datetime64 y los
+    datos de todas las estrellas comparten columnas contiguas
+    """
+    def __init__(self, capacity=16):
+        self._array = np.zeros(capacity, dtype=STAR_DTYPE)
+        self._size = 0
+
+    @classmethod
+    def from_records(cls, stars_data):
+        """Crea el almacén a partir de una lista de diccionarios o un DataFrame"""
+        if hasattr(stars_data, 'columns'):
+            stars_data = stars_data.to_dict('records')
+        store = cls(capacity=max(16, len(stars_data)))
+        for star in stars_data:
+            store.append(star)
+        return store
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Crea el almacén a partir de un diccionario de columnas (arrays)"""
+        store = cls(capacity=max(16, len(columns['name'])))
+        store.extend(columns)
+        return store
+
+    @property
+    def records(self):
+        """Vista (sin copia) de las filas ocupadas"""
+        return self._array[:self._size]
+
+    def column(self, field):
+        """Vista (sin copia) de una columna"""
+        return self.records[field]
+
+    def append(self, star):
+        """Añade una estrella (diccionario con los campos de add_star)"""
+        if self._size == len(self._array):
+            # Crecimiento geométrico, como una lista de Python
+            grown = np.zeros(max(16, 2 * len(self._array)), dtype=STAR_DTYPE)
+            grown[:self._size] = self._array[:self._size]
+            self._array = grown
+
+        date1 = np.datetime64(star['date1'], 'D')
+        date2 = np.datetime64(star['date2'], 'D')
+        delta_time = star.get('delta_time')
+        if delta_time is None:
+            delta_time = (date2 - date1).astype(np.int64) / 365.25
+
+        row = self._array[self._size]
+        row['name'] = star['name']
+        row['angular_displacement'] = star['angular_displacement']
+        row['date1'] = date1
+        row['date2'] = date2
+        row['delta_time'] = delta_time
+        for field in ('parallax', 'vr', 'B', 'V'):
+            row[field] = star[field]
+        self._size += 1
+
+    def extend(self, columns):
+        """Añade al final las estrellas de un diccionario de columnas o de otro almacén"""
+        columns = getattr(columns, 'records', columns)
+        size = len(columns['name'])
+        needed = self._size + size
+        if needed > len(self._array):
+            grown = np.zeros(max(16, 2 * len(self._array), needed), dtype=STAR_DTYPE)
+            grown[:self._size] = self._array[:self._size]
+            self._array = grown
+        for field in STAR_DTYPE.names:
+            self._array[field][self._size:needed] = columns[field]
+        self._size = needed
+
+    def clear(self):
+        self._size = 0
+
+    def to_dataframe(self):
+        """DataFrame con las columnas del almacén"""
+        import pandas as pd
+        return pd.DataFrame({field: self.records[field] for field in STAR_DTYPE.names})
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+# tracing.py
+# Medición de tiempos por etapa (SIMBAD, cálculos, tablas, diagrama HR,
+# exportación). Desactivada por defecto: span() devuelve entonces un contexto
+# vacío compartido y no mide nada. Activación:
+#   python main.py --trace traza.json      (o ESTRELLAS_TRACE=traza.json)
+# La traza se guarda en formato Chrome trace (chrome://tracing, Perfetto)
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+TRACE_ENV = 'ESTRELLAS_TRACE'
+
+_enabled = False
+_trace_path = None
+_events = []
+# Última medición de cada etapa: {etapa: (segundos, estrellas)}
+_last = {}
+_lock = threading.Lock()
+# Origen de tiempos de la traza
+_origin = time.perf_counter()
+_NULL_SPAN = nullcontext()
+
+class Span:
+    """Intervalo medido de una etapa; stars se puede fijar dentro del bloque"""
+    __slots__ = ('name', 'stars', 'args', 'start')
+
+    def __init__(self, name, stars=None, args=None):
+        self.name = name
+        self.stars = stars
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _record(self, time.perf_counter(), exc_type)
+        return False
+
+def enable(path=None):
+    """Activa la medición; si se indica path, la traza se guarda ahí al salir"""
+    global _enabled, _trace_path
+    if path and _trace_path is None:
+        atexit.register(write_trace)
+    _enabled = True
+    _trace_path = path or _trace_path
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def is_enabled():
+    return _enabled
+
+def span(name, stars=None, **args):
+    """
+    Contexto que mide una etapa:
+        with span('calcular', stars=len(datos)):
+            ...
+    Con la medición desactivada no hace nada
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, stars, args)
+
+def _record(current, end, exc_type):
+    """Guarda el intervalo como evento completo ('X') de Chrome trace"""
+    duration = end - current.start
+    args = dict(current.args or {})
+    if current.stars is not None:
+        args['stars'] = int(current.stars)
+    if exc_type is not None:
+        args['error'] = exc_type.__name__
+    event = {
+        'name': current.name,
+        'cat': current.name.split('.')[0],
+        'ph': 'X',
+        'ts': (current.start - _origin) * 1e6,
+        'dur': duration * 1e6,
+        'pid': os.getpid(),
+        'tid': threading.get_ident(),
+        'args': args
+    }
+    with _lock:
+        _events.append(event)
+        _last[current.name] = (duration, current.stars)
+
+def events():
+    """Copia de los eventos registrados"""
+    with _lock:
+        return list(_events)
+
+def last_run():
+    """Última duración (s) y número de estrellas de cada etapa"""
+    with _lock:
+        return dict(_last)
+
+def summary():
+    """Resumen de una línea de la última medición de cada etapa"""
+    parts = []
+    for name, (seconds, stars) in last_run().items():
+        count = f", {stars} estr." if stars is not None else ''
+        parts.append(f"{name}: {seconds * 1000:.0f} ms{count}")
+    return ' | '.join(parts)
+
+def write_trace(path=None):
+    """Escribe los eventos en formato Chrome trace (JSON)"""
+    path = path or _trace_path
+    if not path:
+        return None
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events(), 'displayTimeUnit': 'ms'}, f)
+    return path
+
+def reset():
+    """Borra los eventos y las últimas mediciones"""
+    with _lock:
+        _events.clear()
+        _last.clear()
+
+# Activación por variable de entorno (p. ej. en producción, sin tocar el código)
+if os.environ.get(TRACE_ENV):
+    enable(os.environ[TRACE_ENV])
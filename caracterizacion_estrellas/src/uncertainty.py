@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+# uncertainty.py
+# Propagación de incertidumbres por Monte Carlo sobre los cálculos de star_data
+import numpy as np
+from src.star_data import calculate_batch
+
+# Magnitudes de las que se dan percentiles
+MC_QUANTITIES = ['Distancia', 'Mv', 'Vt', 'V_total']
+DEFAULT_PERCENTILES = (16, 50, 84)
+# Máximo de elementos (estrellas x muestras) por bloque: acota la memoria
+DEFAULT_BLOCK_ELEMENTS = 2_000_000
+
+def propagate_uncertainties(angular_displacement, delta_time_years, parallax_arcsec, B, V, Vr,
+                            sigma_angular=0.0, sigma_parallax=0.0, sigma_B=0.0, sigma_V=0.0,
+                            sigma_Vr=0.0, samples=1000, percentiles=DEFAULT_PERCENTILES,
+                            block_elements=DEFAULT_BLOCK_ELEMENTS, seed=None):
+    """
+    Propaga errores gaussianos de las medidas a distancia, Mv, Vt y V_total
+    Args:
+        angular_displacement, delta_time_years, parallax_arcsec, B, V, Vr:
+            Valores medidos (arrays de N estrellas, como en calculate_batch)
+        sigma_*: Incertidumbres (1 sigma) de cada medida, escalares o arrays
+        samples: Número de muestras por estrella
+        percentiles: Percentiles a devolver
+        block_elements: Máximo de elementos estrellas x muestras por bloque
+        seed: Semilla del generador aleatorio
+    Returns:
+        dict: {magnitud: array (N, len(percentiles))} para MC_QUANTITIES
+    """
+    measured = (angular_displacement, parallax_arcsec, B, V, Vr)
+    n = np.broadcast(*[np.atleast_1d(x) for x in measured]).shape[0]
+    values = [np.broadcast_to(np.asarray(x, dtype=np.float64), (n,)) for x in measured]
+    sigmas = [np.broadcast_to(np.asarray(s, dtype=np.float64), (n,))
+              for s in (sigma_angular, sigma_parallax, sigma_B, sigma_V, sigma_Vr)]
+    delta_time = np.broadcast_to(np.asarray(delta_time_years, dtype=np.float64), (n,))
+
+    rng = np.random.default_rng(seed)
+    block = max(1, block_elements // samples)
+    output = {key: np.empty((n, len(percentiles))) for key in MC_QUANTITIES}
+    # Ruido en float32: la mitad de memoria y generación más rápida
+    noise = np.empty((min(block, n), samples), dtype=np.float32)
+
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        rows = stop - start
+
+        # Muestras (estrellas x muestras) de cada medida
+        drawn = []
+        for value, sigma in zip(values, sigmas):
+            if not np.any(sigma[start:stop]):
+                # Medida sin incertidumbre: no hace falta muestrear
+                drawn.append(value[start:stop, None])
+                continue
+            rng.standard_normal(out=noise[:rows], dtype=np.float32)
+            drawn.append(value[start:stop, None] + sigma[start:stop, None] * noise[:rows])
+        angular, parallax, b_mag, v_mag, vr = drawn
+
+        result = calculate_batch(angular, delta_time[start:stop, None], parallax, b_mag, v_mag, vr)
+        for key in MC_QUANTITIES:
+            # Las medidas sin muestrear dan columnas de una sola muestra
+            sampled = np.broadcast_to(result[key], (rows, samples))
+            output[key][start:stop] = _percentiles(sampled, percentiles)
+    return output
+
+def _percentiles(samples, percentiles):
+    """
+    Percentiles por fila (interpolación lineal, como np.percentile) a partir
+    de una ordenación, bastante más rápida que np.percentile por ejes
+    """
+    ordered = np.sort(samples, axis=1)
+    position = np.asarray(percentiles, dtype=np.float64) / 100 * (ordered.shape[1] - 1)
+    lower = np.floor(position).astype(np.intp)
+    upper = np.minimum(lower + 1, ordered.shape[1] - 1)
+    fraction = position - lower
+    low, high = ordered[:, lower], ordered[:, upper]
+    with np.errstate(invalid='ignore'):
+        # Sin interpolar entre valores iguales (evita inf - inf)
+        return np.where(low == high, low, low + (high - low) * fraction)
+
+def propagate_dataframe(df, samples=1000, percentiles=DEFAULT_PERCENTILES,
+                        block_elements=DEFAULT_BLOCK_ELEMENTS, seed=None):
+    """
+    propagate_uncertainties para un catálogo (columnas de add_star más
+    e_angular_displacement, e_parallax, e_B, e_V y e_vr; las que falten valen 0)
+    Returns:
+        DataFrame: 'Nombre' y una columna por magnitud y percentil (p. ej. 'Mv_p50')
+    """
+    import pandas as pd
+
+    def sigma(column):
+        return df[column].fillna(0).to_numpy(dtype=np.float64) if column in df.columns else 0.0
+
+    output = propagate_uncertainties(
+        df['angular_displacement'].to_numpy(), df['delta_time'].to_numpy(),
+        df['parallax'].to_numpy(), df['B'].to_numpy(), df['V'].to_numpy(), df['vr'].to_numpy(),
+        sigma_angular=sigma('e_angular_displacement'), sigma_parallax=sigma('e_parallax'),
+        sigma_B=sigma('e_B'), sigma_V=sigma('e_V'), sigma_Vr=sigma('e_vr'),
+        samples=samples, percentiles=percentiles, block_elements=block_elements, seed=seed)
+
+    columns = {'Nombre': df['name'].to_numpy()}
+    for key in MC_QUANTITIES:
+        for i, p in enumerate(percentiles):
+            columns[f"{key}_p{p:g}"] = output[key][:, i]
+    return pd.DataFrame(columns)
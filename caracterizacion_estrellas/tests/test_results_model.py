@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+# test_results_model.py
+from datetime import date
+from src.results_model import ResultsModel
+
+STAR = {
+    'name': 'HD 103095',
+    'angular_displacement': 4.0,
+    'date1': date(2000, 1, 1),
+    'date2': date(2010, 1, 1),
+    'parallax': 0.109,
+    'vr': -98.0,
+    'B': 7.2,
+    'V': 6.4
+}
+
+def test_appended_duplicate_is_an_added_row():
+    """Una estrella repetida al final es una fila nueva aunque no se recalcule"""
+    model = ResultsModel()
+    model.update([STAR])
+    diff = model.update([STAR, dict(STAR)])
+    assert diff['appended_only']
+    assert diff['added'] == [1]
+    assert len(diff['results']) == 2
+
+def test_edited_row_is_recalculated():
+    model = ResultsModel()
+    model.update([STAR])
+    diff = model.update([dict(STAR, V=6.5)])
+    assert not diff['appended_only']
+    assert diff['added'] == [0]
+    assert diff['removed'] == 1
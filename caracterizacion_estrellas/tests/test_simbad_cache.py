@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+# test_simbad_cache.py
+import types
+import pytest
+from src import simbad_cache
+from src.simbad_cache import SimbadCache
+
+VEGA = {'main_id': '* alf Lyr', 'ids': ['* alf Lyr', 'HD 172167', 'NAME Vega'],
+        'radial_velocity_km_s': -20.6, 'parallax_arcsec': 0.13, 'mag_B': 0.03, 'mag_V': 0.03}
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Sustituye time.time() de la caché por un reloj que solo avanza a mano"""
+    fake = types.SimpleNamespace(now=1000.0)
+    fake.time = lambda: fake.now
+    monkeypatch.setattr(simbad_cache, 'time', fake)
+    return fake
+
+def star(main_id, **values):
+    return dict({'main_id': main_id, 'ids': [], 'mag_V': 1.0}, **values)
+
+def test_entries_expire_after_ttl(clock):
+    cache = SimbadCache(':memory:', ttl=60)
+    cache.put('HD 103095', star('HD 103095'))
+    clock.now += 60
+    assert cache.get('HD 103095')['mag_V'] == 1.0
+    clock.now += 1
+    assert cache.get('HD 103095') is None
+    assert cache.stats()['entries'] == 0
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = SimbadCache(':memory:', max_entries=2)
+    cache.put('A', star('A'))
+    clock.now += 1
+    cache.put('B', star('B'))
+    clock.now += 1
+    cache.get('A')  # A pasa a ser la más reciente
+    clock.now += 1
+    cache.put('C', star('C'))
+    assert cache.get('B') is None
+    assert cache.get('A') is not None and cache.get('C') is not None
+
+def test_aliases_resolve_to_main_id(clock):
+    cache = SimbadCache(':memory:')
+    cache.put('Vega', VEGA)
+    data = cache.get('hd  172167')
+    assert data['main_id'] == '* alf Lyr'
+    assert data['name'] == 'hd  172167'
+    assert cache.canonical_ids(['Vega', 'NAME Vega', 'HD 172167', 'Sirius']) == \
+        ['* ALF LYR', '* ALF LYR', '* ALF LYR', 'SIRIUS']
+
+def test_evicted_entry_drops_its_aliases(clock):
+    cache = SimbadCache(':memory:', max_entries=1)
+    cache.put('Vega', VEGA)
+    clock.now += 1
+    cache.put('Sirius', star('* alf CMa', ids=['HD 48915']))
+    assert cache.resolve('HD 172167') == 'HD 172167'
+    assert cache.resolve('HD 48915') == '* ALF CMA'
+    assert cache.stats()['aliases'] == 2  # 'SIRIUS' y 'HD 48915'
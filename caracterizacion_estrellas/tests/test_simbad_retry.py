@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+
+# test_simbad_retry.py
+import urllib.error
+from src.simbad_retry import is_transient
+
+class DALServiceError(Exception):
+    """Imitación de pyvo.dal.DALServiceError (código HTTP en .code)"""
+    def __init__(self, code=None):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+def test_http_client_errors_are_not_transient():
+    assert not is_transient(DALServiceError(400))
+    assert not is_transient(DALServiceError(404))
+    assert not is_transient(urllib.error.HTTPError('url', 404, 'Not Found', {}, None))
+
+def test_server_errors_and_network_failures_are_transient():
+    assert is_transient(DALServiceError(503))
+    assert is_transient(DALServiceError())  # Sin respuesta HTTP
+    assert is_transient(urllib.error.HTTPError('url', 502, 'Bad Gateway', {}, None))
+    assert is_transient(TimeoutError())
+    assert not is_transient(ValueError())
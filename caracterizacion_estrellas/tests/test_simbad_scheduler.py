@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+# test_simbad_scheduler.py
+import threading
+import time
+import pytest
+from src.simbad_retry import (CircuitBreaker, SimbadError, SimbadUnavailableError,
+                              call_with_retries)
+from src.simbad_scheduler import RequestScheduler
+
+class FakeClock:
+    """Reloj que solo avanza con advance()"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+def start(target):
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "tiempo de espera agotado"
+        time.sleep(0.001)
+
+def test_token_bucket_refills_with_the_clock():
+    clock = FakeClock()
+    # rate alto: el hilo que espera vuelve a mirar el reloj falso cada 10 ms reales
+    scheduler = RequestScheduler(rate=100, burst=2, max_concurrent=None, clock=clock)
+    scheduler.acquire()
+    scheduler.acquire()  # Ráfaga completa sin esperar
+    waiting = start(scheduler.acquire)
+    waiting.join(0.1)
+    assert waiting.is_alive()
+    clock.advance(0.015)  # Una ficha y media
+    waiting.join(2.0)
+    assert not waiting.is_alive()
+
+def test_token_bucket_is_capped_at_burst():
+    clock = FakeClock()
+    scheduler = RequestScheduler(rate=100, burst=2, max_concurrent=None, clock=clock)
+    clock.advance(60)
+    scheduler.acquire()
+    scheduler.acquire()
+    waiting = start(scheduler.acquire)
+    waiting.join(0.1)
+    assert waiting.is_alive()
+    clock.advance(0.015)
+    waiting.join(2.0)
+    assert not waiting.is_alive()
+
+def test_concurrency_limit():
+    scheduler = RequestScheduler(rate=None, max_concurrent=1)
+    scheduler.acquire()
+    waiting = start(scheduler.acquire)
+    waiting.join(0.1)
+    assert waiting.is_alive()
+    scheduler.release()
+    waiting.join(2.0)
+    assert not waiting.is_alive()
+    assert scheduler.stats()['active'] == 1
+
+def test_callers_are_served_round_robin():
+    scheduler = RequestScheduler(rate=None, max_concurrent=1)
+    order = []
+
+    def request(caller):
+        with scheduler.slot(caller):
+            order.append(caller)
+
+    scheduler.acquire()
+    threads = []
+    for queued, caller in enumerate(['lote', 'lote', 'lote', 'gui'], start=1):
+        threads.append(start(lambda caller=caller: request(caller)))
+        wait_until(lambda: scheduler.stats()['queued'] == queued)
+    scheduler.release()
+    for thread in threads:
+        thread.join(2.0)
+    # La consulta de la GUI no espera a que termine el lote
+    assert order == ['lote', 'gui', 'lote', 'lote']
+
+@pytest.mark.parametrize('options', [{'rate': 0}, {'rate': -1}, {'burst': 0},
+                                     {'max_concurrent': 0}])
+def test_invalid_limits_are_rejected(options):
+    with pytest.raises(ValueError):
+        RequestScheduler(**options)
+
+def test_breaker_opens_half_opens_and_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.state == 'closed'
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    with pytest.raises(SimbadUnavailableError):
+        breaker.before_call()
+
+    clock.advance(10)
+    assert breaker.state == 'half-open'
+    breaker.before_call()  # Llamada de prueba
+    with pytest.raises(SimbadUnavailableError):
+        breaker.before_call()  # Solo una prueba a la vez
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    breaker.before_call()
+
+def test_failed_probe_reopens_the_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.advance(10)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    clock.advance(9)
+    assert breaker.state == 'open'
+
+def test_retries_exhausted_open_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=3, clock=FakeClock())
+    calls = []
+
+    def down():
+        calls.append(1)
+        raise TimeoutError("sin respuesta")
+
+    with pytest.raises(SimbadUnavailableError):
+        call_with_retries(down, retries=2, breaker=breaker, sleep=lambda s: None)
+    assert len(calls) == 3
+    assert breaker.state == 'open'
+
+def test_non_transient_error_is_not_retried():
+    breaker = CircuitBreaker(failure_threshold=1, clock=FakeClock())
+    calls = []
+
+    def bad():
+        calls.append(1)
+        raise ValueError("consulta no válida")
+
+    with pytest.raises(SimbadError) as info:
+        call_with_retries(bad, retries=3, breaker=breaker, sleep=lambda s: None)
+    assert not isinstance(info.value, SimbadUnavailableError)
+    assert len(calls) == 1
+    assert breaker.state == 'closed'
@@ -1,15 +1,29 @@
 import matplotlib.pyplot as plt
 import numpy as np
+import os
+import pickle
+import threading
 from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
+from matplotlib.colors import LogNorm
 from adjustText import adjust_text
+from src.tracing import span
 
-def plot_hr_diagram(standard_stars, analyzed_stars, save_path= 'imagenes/hr_diagram_<fecha>.png'):
+DEFAULT_SAVE_PATH = 'imagenes/hr_diagram_<fecha>.png'
+# Número de estrellas a partir del cual se dibuja un mapa de densidad
+DENSITY_THRESHOLD = 20000
+DENSITY_BINS = 300
+
+def plot_hr_diagram(standard_stars, analyzed_stars, save_path=DEFAULT_SAVE_PATH,
+                    density=None, density_threshold=DENSITY_THRESHOLD, bins=DENSITY_BINS):
     """
     Genera el diagrama HR con línea para estrellas estándar y opción de guardado
     Args:
         standard_stars: Lista de tuplas (tipo_espectral, B-V, Mv)
-        analyzed_stars: Lista de diccionarios con datos de estrellas analizadas
+        analyzed_stars: Lista de diccionarios (o DataFrame) con datos de estrellas analizadas
         save_path: Ruta opcional para guardar el gráfico (ej. 'resultados/diagrama_hr.png')
+        density: True/False fuerza el modo densidad; None lo activa por encima
+            de density_threshold estrellas
+        bins: Número de intervalos por eje del mapa de densidad
     Returns:
         fig: Figura de matplotlib
     """
@@ -36,11 +50,14 @@ def plot_hr_diagram(standard_stars, analyzed_stars, save_path= 'imagenes/hr_diag
     
     # # Estrellas analizadas (puntos rojos)
 
-    if analyzed_stars:
-        bv_ana = [star['B-V'] for star in analyzed_stars]
-        mv_ana = [star['Mv'] for star in analyzed_stars]
-        names_ana = [star['Nombre'] for star in analyzed_stars]
+    bv_ana, mv_ana = _analyzed_columns(analyzed_stars)
+    if density is None:
+        density = len(bv_ana) > density_threshold
     
+    if len(bv_ana) and density:
+        # Mapa de densidad: miles de puntos se agrupan en una imagen
+        _plot_density(fig, ax, bv_ana, mv_ana, bins)
+    elif len(bv_ana):
         # Puntos de datos
         ax.scatter(
             bv_ana, mv_ana,
@@ -49,7 +66,8 @@ def plot_hr_diagram(standard_stars, analyzed_stars, save_path= 'imagenes/hr_diag
             s=100,
             edgecolors='black',
             label='Estrellas Analizadas',
-            zorder=3
+            zorder=3,
+            gid='analyzed'
         )
     
         # Lista para almacenar las anotaciones
@@ -204,14 +222,113 @@ def plot_hr_diagram(standard_stars, analyzed_stars, save_path= 'imagenes/hr_diag
     if save_path:
         try:
             # Asegurarse que el directorio existe
-            import os
             os.makedirs(os.path.dirname(save_path), exist_ok=True)
             
             # Guardar en alta resolución (300 dpi)
-            fig.savefig(save_path, dpi=300, bbox_inches='tight')
+            with span('hr.guardado', stars=len(bv_ana)):
+                fig.savefig(save_path, dpi=300, bbox_inches='tight')
             print(f"Diagrama HR guardado en: {save_path}")
         except Exception as e:
             print(f"Error al guardar el gráfico: {str(e)}")
     
     return fig# -*- coding: utf-8 -*-
 
+def update_hr_diagram(fig, analyzed_stars, density_threshold=DENSITY_THRESHOLD):
+    """
+    Actualiza en el sitio los puntos de las estrellas analizadas
+    Returns:
+        bool: False si la figura no admite la actualización (modo densidad o
+            sin puntos previos) y debe regenerarse con plot_hr_diagram
+    """
+    ax = fig.axes[0]
+    scatter = next((c for c in ax.collections if c.get_gid() == 'analyzed'), None)
+    bv, mv = _analyzed_columns(analyzed_stars)
+    if scatter is None or len(bv) > density_threshold:
+        return False
+    
+    offsets = np.column_stack((bv, mv))
+    scatter.set_offsets(offsets)
+    # Reajuste de los límites (manteniendo el eje Mv invertido)
+    finite = np.isfinite(offsets).all(axis=1)
+    ax.update_datalim(offsets[finite])
+    ax.autoscale_view()
+    return True
+
+def export_hr_diagram(fig, save_path=DEFAULT_SAVE_PATH, dpi=300, callback=None):
+    """
+    Exporta el diagrama HR en alta resolución en un hilo en segundo plano
+    Args:
+        fig: Figura de matplotlib (puede estar ya mostrada en pantalla)
+        save_path: Ruta del fichero de imagen
+        dpi: Resolución de la exportación
+        callback: Función callback(save_path, error) llamada desde el hilo
+            al terminar (error es None si todo fue bien)
+    Returns:
+        threading.Thread: Hilo de exportación ya iniciado
+    """
+    # Se exporta una copia para no interferir con el lienzo en pantalla
+    fig_copy = pickle.loads(pickle.dumps(fig))
+    
+    def worker():
+        error = None
+        try:
+            directory = os.path.dirname(save_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            FigureCanvas(fig_copy)
+            with span('hr.guardado'):
+                fig_copy.savefig(save_path, dpi=dpi, bbox_inches='tight')
+            print(f"Diagrama HR guardado en: {save_path}")
+        except Exception as e:
+            error = e
+            print(f"Error al guardar el gráfico: {str(e)}")
+        if callback is not None:
+            callback(save_path, error)
+    
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+    return thread
+
+def _analyzed_columns(analyzed_stars):
+    """Columnas B-V y Mv como arrays (lista de diccionarios o DataFrame)"""
+    if analyzed_stars is None or len(analyzed_stars) == 0:
+        return np.empty(0), np.empty(0)
+    if getattr(analyzed_stars, 'dtype', None) is not None and analyzed_stars.dtype.names:
+        # Array estructurado RESULT_DTYPE: vistas sin copia
+        return (analyzed_stars['B-V'].astype(np.float64, copy=False),
+                analyzed_stars['Mv'].astype(np.float64, copy=False))
+    if hasattr(analyzed_stars, 'columns'):
+        return (analyzed_stars['B-V'].to_numpy(dtype=np.float64),
+                analyzed_stars['Mv'].to_numpy(dtype=np.float64))
+    bv = np.fromiter((star['B-V'] for star in analyzed_stars), dtype=np.float64,
+                     count=len(analyzed_stars))
+    mv = np.fromiter((star['Mv'] for star in analyzed_stars), dtype=np.float64,
+                     count=len(analyzed_stars))
+    return bv, mv
+
+def _plot_density(fig, ax, bv, mv, bins):
+    """Dibuja las estrellas analizadas como histograma 2D con imshow"""
+    finite = np.isfinite(bv) & np.isfinite(mv)
+    bv, mv = bv[finite], mv[finite]
+    if not len(bv):
+        return
+    
+    counts, bv_edges, mv_edges = np.histogram2d(bv, mv, bins=bins)
+    # Celdas vacías transparentes
+    counts = np.ma.masked_equal(counts, 0)
+    
+    image = ax.imshow(
+        counts.T,
+        origin='lower',
+        extent=(bv_edges[0], bv_edges[-1], mv_edges[0], mv_edges[-1]),
+        aspect='auto',
+        interpolation='nearest',
+        cmap='inferno_r',
+        norm=LogNorm(),
+        zorder=0  # Debajo de la secuencia principal y las estrellas estándar
+    )
+    fig.colorbar(image, ax=ax, label='Estrellas por celda')
+    # Entrada en la leyenda para el mapa de densidad: parche vacío (no cambia
+    # los límites) con un color del propio mapa
+    ax.fill_between([], [], facecolor=image.cmap(0.6), edgecolor='black',
+                    label=f'Estrellas Analizadas ({len(bv)})')
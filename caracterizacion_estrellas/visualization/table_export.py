@@ -0,0 +1,109 @@
+# table_export.py
+# Exportación de tablas por bloques de filas (CSV, LaTeX longtable y Excel en
+# modo write-only de openpyxl). Cada bloque se formatea, se escribe y se
+# descarta, así que nunca hace falta la tabla completa como texto
+from pathlib import Path
+import numpy as np
+from pandas.api.types import is_numeric_dtype
+
+# Filas por bloque
+EXPORT_CHUNK_ROWS = 5000
+
+def iter_chunks(table, chunk_rows=EXPORT_CHUNK_ROWS, formatter=None):
+    """
+    Bloques consecutivos de un DataFrame, formateados con formatter(bloque)
+    si se indica
+    """
+    for start in range(0, len(table), chunk_rows):
+        chunk = table.iloc[start:start + chunk_rows]
+        yield formatter(chunk) if formatter is not None else chunk
+
+class ProgressCounter:
+    """Acumula las filas escritas de varias tablas y avisa a progress(hechas, total)"""
+    def __init__(self, tables, progress=None):
+        self.total = sum(len(table) for table in tables)
+        self.done = 0
+        self.progress = progress
+
+    def advance(self, rows):
+        self.done += rows
+        if self.progress is not None:
+            self.progress(self.done, self.total)
+
+def write_csv(table, path, formatter=None, chunk_rows=EXPORT_CHUNK_ROWS, counter=None):
+    """Escribe una tabla en CSV bloque a bloque"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        # Solo la cabecera, con el mismo entrecomillado que el resto
+        table.iloc[:0].to_csv(f, index=False)
+        for chunk in iter_chunks(table, chunk_rows, formatter):
+            chunk.to_csv(f, header=False, index=False)
+            if counter is not None:
+                counter.advance(len(chunk))
+    return Path(path)
+
+def write_latex(tables, path, formatter=None, chunk_rows=EXPORT_CHUNK_ROWS, counter=None):
+    """
+    Escribe varias tablas en un fichero LaTeX como entornos longtable
+    (paquetes longtable y booktabs), emitiendo las filas una a una
+    Args:
+        tables: Lista de (comentario, DataFrame)
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("% Requiere \\usepackage{longtable} y \\usepackage{booktabs}\n")
+        for title, table in tables:
+            f.write(f"\n% {title}\n")
+            align = ''.join('r' if is_numeric_dtype(dtype) else 'l' for dtype in table.dtypes)
+            f.write("\\begin{longtable}{" + align + "}\n")
+            header = ' & '.join(str(col) for col in table.columns) + ' \\\\\n'
+            # Cabecera repetida en cada página
+            f.write("\\toprule\n" + header + "\\midrule\n\\endfirsthead\n")
+            f.write("\\toprule\n" + header + "\\midrule\n\\endhead\n")
+            f.write("\\bottomrule\n\\endlastfoot\n")
+            for chunk in iter_chunks(table, chunk_rows, formatter):
+                for row in chunk.itertuples(index=False, name=None):
+                    f.write(' & '.join(str(value) for value in row) + ' \\\\\n')
+                if counter is not None:
+                    counter.advance(len(chunk))
+            f.write("\\end{longtable}\n")
+    return Path(path)
+
+def write_excel(sheets, path, formatter=None, chunk_rows=EXPORT_CHUNK_ROWS, counter=None):
+    """
+    Escribe varias tablas en un libro Excel con openpyxl en modo write-only
+    (las filas van directamente al fichero, sin guardar las celdas en memoria)
+    Args:
+        sheets: Lista de (nombre de la hoja, DataFrame)
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for sheet_name, table in sheets:
+        sheet = workbook.create_sheet(sheet_name)
+        sheet.append([str(col) for col in table.columns])
+        for chunk in iter_chunks(table, chunk_rows, formatter):
+            for row in _excel_rows(chunk):
+                sheet.append(row)
+            if counter is not None:
+                counter.advance(len(chunk))
+    workbook.save(path)
+    return Path(path)
+
+def _excel_rows(chunk):
+    """
+    Filas de un bloque con valores que openpyxl sabe escribir: NaN como celda
+    vacía, infinitos como texto (igual que DataFrame.to_excel) y fechas de Python
+    """
+    columns = []
+    for col in chunk.columns:
+        values = chunk[col].to_numpy()
+        if values.dtype.kind == 'f':
+            cells = values.astype(object)
+            cells[np.isnan(values)] = None
+            cells[np.isposinf(values)] = 'inf'
+            cells[np.isneginf(values)] = '-inf'
+        elif np.issubdtype(values.dtype, np.datetime64):
+            cells = values.astype('datetime64[us]').astype(object)
+        else:
+            cells = values
+        columns.append(cells)
+    return zip(*columns)
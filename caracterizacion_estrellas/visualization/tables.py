@@ -1,42 +1,124 @@
 # tables.py
+# Tablas de datos de entrada y de resultados. Las columnas se guardan como
+# números (float64) y fechas (datetime64); el texto con los decimales de cada
+# columna solo se genera al mostrar o exportar, con format_table
+import numpy as np
 import pandas as pd
+from src.star_data import as_array, is_structured
+
+# Cabeceras de las tablas: campo de los datos -> columna mostrada
+INPUT_HEADERS = {
+    'name': 'Nombre',
+    'angular_displacement': 'φ (")',
+    'date1': 'Fecha 1ª obs.',
+    'date2': 'Fecha 2ª obs.',
+    'delta_time': 'Δt (años)',
+    'parallax': 'π (")',
+    'vr': 'Vr (km/s)',
+    'B': 'B',
+    'V': 'V'
+}
+RESULT_HEADERS = {
+    'Nombre': 'Nombre',
+    'Mov_propio': 'Mov. propio ("/año)',
+    'Distancia': 'Distancia (pc)',
+    'B-V': 'Índice espectral (B-V)',
+    'Mv': 'Mv',
+    'Vt': 'Vt (km/s)',
+    'V_total': 'V total (km/s)'
+}
+# Formato de presentación de las columnas numéricas
+COLUMN_FORMATS = {
+    'φ (")': '%.4f',
+    'Δt (años)': '%.2f',
+    'π (")': '%.4f',
+    'Vr (km/s)': '%.2f',
+    'B': '%.2f',
+    'V': '%.2f',
+    'Mov. propio ("/año)': '%.4f',
+    'Distancia (pc)': '%.2f',
+    'Índice espectral (B-V)': '%.2f',
+    'Mv': '%.2f',
+    'Vt (km/s)': '%.2f',
+    'V total (km/s)': '%.2f'
+}
+
+def record_columns(records, fields):
+    """
+    Columnas de una lista de diccionarios, un DataFrame, un StarStore o un
+    array estructurado (en los tres últimos casos, sin copiar los datos)
+    """
+    if isinstance(records, pd.DataFrame):
+        return {field: records[field].to_numpy() for field in fields}
+    if is_structured(records):
+        data = as_array(records)
+        return {field: data[field] for field in fields}
+    return {field: np.array([record[field] for record in records]) for field in fields}
+
+def date_strings(values):
+    """Fechas como texto 'YYYY-MM-DD' (datetime64 o fechas de Python)"""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return np.datetime_as_string(values, unit='D')
+    return np.array([value.strftime('%Y-%m-%d') for value in values], dtype=object)
+
+def format_column(values, fmt):
+    """Formatea una columna numérica completa ('%.2f', ...)"""
+    return np.char.mod(fmt, np.asarray(values, dtype=np.float64))
+
+def _date_column(values):
+    """Columna de fechas como datetime64 (las fechas de Python se convierten)"""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values
+    return np.array([np.datetime64(value, 'D') for value in values], dtype='datetime64[D]')
 
 def create_input_table(stars_data):
-    """Crea tabla de datos de entrada"""
-    data = []
-    for star in stars_data:
-        delta_time = (star['date2'] - star['date1']).days / 365.25
-        
-        data.append([
-            star['name'],
-            star['date1'].strftime('%Y-%m-%d'),
-            star['date2'].strftime('%Y-%m-%d'),
-            f"{delta_time:.2f}",
-            star['vr'],
-            star['B'],
-            star['V']
-        ])
-    
-    return pd.DataFrame(data, columns=[
-        'Nombre', 'Fecha 1ª obs.', 'Fecha 2ª obs.', 
-        'Δt (años)', 'Vr (km/s)', 'B', 'V'
-    ])
+    """Crea tabla de datos de entrada (valores numéricos, sin formatear)"""
+    cols = record_columns(stars_data, list(INPUT_HEADERS))
+    table = {}
+    for field, header in INPUT_HEADERS.items():
+        if field == 'name':
+            table[header] = cols[field]
+        elif field in ('date1', 'date2'):
+            table[header] = _date_column(cols[field])
+        else:
+            table[header] = np.asarray(cols[field], dtype=np.float64)
+    return pd.DataFrame(table)
 
 def create_results_table(calculated_results):
-    """Crea tabla de resultados calculados"""
-    data = []
-    for star in calculated_results:
-        data.append([
-            star['Nombre'],
-            f"{star['Mov_propio']:.4f}",
-            f"{star['Distancia']:.2f}",
-            f"{star['B-V']:.2f}",
-            f"{star['Mv']:.2f}",
-            f"{star['Vt']:.2f}",
-            f"{star['V_total']:.2f}"
-        ])
-    
-    return pd.DataFrame(data, columns=[
-        'Nombre', 'Mov. propio ("/año)', 'Distancia (pc)', 
-        'Índice espectral (B-V)', 'Mv', 'Vt (km/s)', 'V total (km/s)'
-    ])
\ No newline at end of file
+    """Crea tabla de resultados calculados (valores numéricos, sin formatear)"""
+    cols = record_columns(calculated_results, list(RESULT_HEADERS))
+    return pd.DataFrame({
+        header: cols[field] if field == 'Nombre' else np.asarray(cols[field], dtype=np.float64)
+        for field, header in RESULT_HEADERS.items()
+    })
+
+def format_table(table, formats=COLUMN_FORMATS):
+    """
+    Versión de texto de una tabla (o de un bloque de filas) para mostrarla o
+    exportarla: columnas numéricas con el formato de formats y fechas como
+    'YYYY-MM-DD', formateadas columna a columna
+    """
+    formatted = {}
+    for col in table.columns:
+        values = table[col].to_numpy()
+        if np.issubdtype(values.dtype, np.datetime64):
+            formatted[col] = date_strings(values)
+        elif col in formats and values.dtype.kind == 'f':
+            formatted[col] = format_column(values, formats[col])
+        else:
+            formatted[col] = values
+    return pd.DataFrame(formatted, index=table.index)
+
+def flag_duplicates(table, canonical_ids):
+    """
+    Añade la columna 'Duplicada' a una tabla: en las estrellas que son el
+    mismo objeto (misma clave canónica de SIMBAD, p. ej. 'GJ 451' y
+    'HD 103095'), el nombre de su primera aparición; vacía en el resto
+    """
+    keys = pd.Series(np.asarray(canonical_ids, dtype=object), index=table.index)
+    first = table['Nombre'].groupby(keys, sort=False).transform('first')
+    flagged = table.copy()
+    flagged['Duplicada'] = np.where(keys.duplicated(keep=False), first.astype(object), '')
+    return flagged